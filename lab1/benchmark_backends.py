@@ -0,0 +1,37 @@
+import time
+
+from main import BBS_BACKENDS, bbs_bytes, generate_blum_prime
+
+# Porównanie backendów arytmetyki generatora BBS dla modułów od 64 do 4096 bitów.
+# Dla każdego backendu mierzymy liczbę podniesień do kwadratu modulo n na sekundę.
+
+MODULUS_BITS = [64, 128, 256, 512, 1024, 2048, 4096]
+
+# Liczba kroków BBS mierzona dla danego rozmiaru modułu (mniej kroków dla dużych modułów).
+# Wynik jest wielokrotnością 64, czyli pełnej liczby bloków 64-krokowych w bbs_bytes.
+def steps_for(bits):
+    return max(2048, 400000 // (bits // 64)) // 64 * 64
+
+# Funkcja measure_backend(n, backend, steps) zwraca liczbę kroków BBS na sekundę.
+# Przy bits_per_step=1 każdy bajt wyjścia to 8 kroków.
+def measure_backend(n, backend, steps):
+    start = time.perf_counter()
+    bbs_bytes(n, steps // 8, seed=3, backend=backend)
+    elapsed = time.perf_counter() - start
+    return steps / elapsed
+
+def benchmark_backends(modulus_bits=MODULUS_BITS):
+    results = {}
+    for bits in modulus_bits:
+        n = generate_blum_prime(bits // 2) * generate_blum_prime(bits // 2)
+        steps = steps_for(bits)
+        results[bits] = {name: measure_backend(n, name, steps) for name in BBS_BACKENDS}
+    return results
+
+if __name__ == "__main__":
+    names = list(BBS_BACKENDS)
+    print(f"Dostępne backendy: {', '.join(names)}")
+    print(f"{'Moduł [bit]':<12} | " + " | ".join(f"{name + ' [kroki/s]':<20}" for name in names))
+    print("-" * (15 + 23 * len(names)))
+    for bits, rates in benchmark_backends().items():
+        print(f"{bits:<12} | " + " | ".join(f"{rates[name]:<20.0f}" for name in names))
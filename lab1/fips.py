@@ -0,0 +1,283 @@
+import argparse
+import io
+import os
+from itertools import islice
+
+import numpy as np
+
+# Moduł zawiera zwektoryzowaną (NumPy) wersję baterii testów FIPS 140-1 z main.py.
+# Testy działają na spakowanych tablicach bitów:
+#   - uint8: kolejne bajty, bity w kolejności od najstarszego (konwencja np.packbits),
+#   - uint64 (lub inny typ całkowity): interpretowane przez bajty pamięci (.view(np.uint8)).
+# Parametr nbits określa liczbę ważnych bitów (domyślnie wszystkie bity tablicy).
+
+# Tablica liczby jedynek dla każdej wartości bajtu (gdy brak np.bitwise_count).
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Przedziały liczebności serii dla długości 1-6 (takie same jak w main.runs_test).
+RUNS_VALID_RANGES = {
+    1: (2315, 2685),
+    2: (1114, 1386),
+    3: (527, 723),
+    4: (240, 384),
+    5: (103, 209),
+    6: (103, 209)
+}
+
+# Funkcja pack_bits(bits) zamienia listę bitów (0/1) na spakowaną tablicę uint8.
+def pack_bits(bits):
+    return np.packbits(np.asarray(bits, dtype=np.uint8))
+
+# Funkcja _as_bytes(packed, nbits) sprowadza tablicę do widoku uint8 i ustala liczbę ważnych bitów.
+def _as_bytes(packed, nbits=None):
+    packed = np.ascontiguousarray(packed)
+    if packed.dtype != np.uint8:
+        packed = packed.view(np.uint8)
+    if nbits is None:
+        nbits = packed.size * 8
+    if nbits > packed.size * 8:
+        raise ValueError("nbits przekracza rozmiar tablicy bitów")
+    return packed, nbits
+
+# Funkcja _popcount(data) zwraca liczbę jedynek w tablicy bajtów.
+def _popcount(data):
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(data).sum(dtype=np.int64))
+    return int(_POPCOUNT_TABLE[data].sum(dtype=np.int64))
+
+# Funkcja unpack_bits(packed, nbits) zwraca tablicę uint8 z pojedynczymi bitami.
+def unpack_bits(packed, nbits=None):
+    packed, nbits = _as_bytes(packed, nbits)
+    return np.unpackbits(packed, count=nbits)
+
+# Funkcja count_ones(packed, nbits) liczy jedynki wśród pierwszych nbits bitów (popcount po bajtach).
+def count_ones(packed, nbits=None):
+    packed, nbits = _as_bytes(packed, nbits)
+    full_bytes, rest = divmod(nbits, 8)
+    ones = _popcount(packed[:full_bytes])
+    if rest:
+        # Maskujemy bity wypełnienia w ostatnim, niepełnym bajcie.
+        mask = (0xFF << (8 - rest)) & 0xFF
+        ones += bin(int(packed[full_bytes]) & mask).count('1')
+    return ones
+
+# Funkcja run_lengths(bits) koduje ciąg bitów jako serie (RLE) na podstawie różnic sąsiednich bitów.
+# Zwraca krotkę (wartości serii, długości serii).
+def run_lengths(bits):
+    if bits.size == 0:
+        return bits[:0], np.zeros(0, dtype=np.int64)
+    changes = np.flatnonzero(bits[1:] != bits[:-1]) + 1
+    boundaries = np.concatenate(([0], changes, [bits.size]))
+    return bits[boundaries[:-1]], np.diff(boundaries)
+
+# Funkcja single_bits_test_np(packed, nbits) - odpowiednik main.single_bits_test.
+def single_bits_test_np(packed, nbits=None):
+    return 9725 < count_ones(packed, nbits) < 10275
+
+# Funkcja runs_counts(values, lengths) zlicza serie o długościach 1..6 (dłuższe liczone jako 6)
+# osobno dla zer i jedynek. Zwraca tablicę o kształcie (2, 7) indeksowaną [bit, długość].
+def runs_counts(values, lengths):
+    clipped = np.minimum(lengths, 6)
+    counts = np.zeros((2, 7), dtype=np.int64)
+    for bit in (0, 1):
+        counts[bit] = np.bincount(clipped[values == bit], minlength=7)[:7]
+    return counts
+
+# Funkcja runs_counts_pass(counts) sprawdza liczebności serii względem przedziałów RUNS_VALID_RANGES.
+def runs_counts_pass(counts):
+    for length in range(1, 7):
+        min_val, max_val = RUNS_VALID_RANGES[length]
+        for bit in (0, 1):
+            if not (min_val <= counts[bit, length] <= max_val):
+                return False
+    return True
+
+# Funkcja runs_test_np(packed, nbits) - odpowiednik main.runs_test.
+def runs_test_np(packed, nbits=None):
+    values, lengths = run_lengths(unpack_bits(packed, nbits))
+    return runs_counts_pass(runs_counts(values, lengths))
+
+# Funkcja long_runs_test_np(packed, nbits) - odpowiednik main.long_runs_test (brak serii >= 26).
+def long_runs_test_np(packed, nbits=None):
+    _, lengths = run_lengths(unpack_bits(packed, nbits))
+    return lengths.size == 0 or int(lengths.max()) < 26
+
+# Funkcja nibble_counts(packed, nbits) zlicza wartości pełnych bloków 4-bitowych (bincount po półbajtach).
+def nibble_counts(packed, nbits=None):
+    packed, nbits = _as_bytes(packed, nbits)
+    nibbles = np.empty(packed.size * 2, dtype=np.uint8)
+    nibbles[0::2] = packed >> 4
+    nibbles[1::2] = packed & 0x0F
+    return np.bincount(nibbles[:nbits // 4], minlength=16)
+
+# Funkcja poker_statistic(counts, extra_blocks) oblicza statystykę x testu pokerowego.
+# extra_blocks to liczba niepełnych bloków (każdy z nich jest osobnym blokiem w main.poker_test).
+def poker_statistic(counts, extra_blocks=0):
+    squares = int(np.dot(counts.astype(np.int64), counts.astype(np.int64))) + extra_blocks
+    return (16 / 5000) * squares - 5000
+
+# Funkcja poker_test_np(packed, nbits) - odpowiednik main.poker_test.
+def poker_test_np(packed, nbits=None):
+    packed, nbits = _as_bytes(packed, nbits)
+    x = poker_statistic(nibble_counts(packed, nbits), 1 if nbits % 4 else 0)
+    return 2.16 <= x <= 46.17
+
+# Funkcja fips_battery_np(packed, nbits) wykonuje wszystkie cztery testy na jednej tablicy.
+# Rozpakowanie bitów i kodowanie serii wykonywane jest tylko raz dla testów serii.
+def fips_battery_np(packed, nbits=None):
+    packed, nbits = _as_bytes(packed, nbits)
+    values, lengths = run_lengths(unpack_bits(packed, nbits))
+    return {
+        "single_bits": single_bits_test_np(packed, nbits),
+        "runs": runs_counts_pass(runs_counts(values, lengths)),
+        "long_runs": lengths.size == 0 or int(lengths.max()) < 26,
+        "poker": poker_test_np(packed, nbits),
+    }
+
+# =====================================================================
+# Tryb strumieniowy: bateria FIPS na kolejnych oknach 20000-bitowych
+# =====================================================================
+
+# Długość okna, dla której zdefiniowane są przedziały testów FIPS 140-1.
+WINDOW_BITS = 20000
+
+# Domyślna liczba bitów wczytywanych jednorazowo ze źródła.
+DEFAULT_CHUNK_BITS = 1 << 20
+
+# Klasa FipsWindow przechowuje stan jednego okna testowego, aktualizowany kolejnymi fragmentami bitów.
+# Bieżąca (niezamknięta) seria oraz niepełny blok 4-bitowy są przenoszone pomiędzy fragmentami,
+# dzięki czemu granice fragmentów nie wpływają na wynik.
+class FipsWindow:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.nbits = 0
+        self.ones = 0
+        self.nibbles = np.zeros(16, dtype=np.int64)
+        self.pending = np.zeros(0, dtype=np.uint8)  # bity niepełnego bloku 4-bitowego
+        self.runs = np.zeros((2, 7), dtype=np.int64)
+        self.max_run = 0
+        self.run_bit = 0  # wartość bieżącej serii
+        self.run_len = 0  # długość bieżącej serii (0 - brak serii)
+
+    # Metoda update(bits) dołącza do okna fragment rozpakowanych bitów (tablica uint8 z wartościami 0/1).
+    def update(self, bits):
+        if bits.size == 0:
+            return
+        self.nbits += bits.size
+        self.ones += int(np.count_nonzero(bits))
+
+        # Bloki 4-bitowe - dołączamy bity pozostałe z poprzedniego fragmentu.
+        data = np.concatenate((self.pending, bits)) if self.pending.size else bits
+        full = data.size - data.size % 4
+        if full:
+            values = (data[0:full:4] << 3) | (data[1:full:4] << 2) | (data[2:full:4] << 1) | data[3:full:4]
+            self.nibbles += np.bincount(values, minlength=16)
+        self.pending = data[full:].copy()
+
+        # Serie - pierwsza seria fragmentu może być kontynuacją serii z poprzedniego fragmentu.
+        values, lengths = run_lengths(bits)
+        if self.run_len:
+            if values[0] == self.run_bit:
+                lengths = lengths.copy()
+                lengths[0] += self.run_len
+            else:
+                self._close_runs(np.array([self.run_bit], dtype=np.uint8), np.array([self.run_len]))
+        self._close_runs(values[:-1], lengths[:-1])
+        self.run_bit = int(values[-1])
+        self.run_len = int(lengths[-1])
+
+    def _close_runs(self, values, lengths):
+        if lengths.size:
+            self.runs += runs_counts(values, lengths)
+            self.max_run = max(self.max_run, int(lengths.max()))
+
+    # Metoda finish() zamyka bieżącą serię i zwraca wyniki czterech testów dla okna.
+    def finish(self):
+        if self.run_len:
+            self._close_runs(np.array([self.run_bit], dtype=np.uint8), np.array([self.run_len]))
+            self.run_len = 0
+        x = poker_statistic(self.nibbles, 1 if self.pending.size else 0)
+        return {
+            "single_bits": 9725 < self.ones < 10275,
+            "runs": runs_counts_pass(self.runs),
+            "long_runs": self.max_run < 26,
+            "poker": 2.16 <= x <= 46.17,
+        }
+
+# Funkcja iter_bit_chunks(source, chunk_bits) zamienia źródło bitów na kolejne fragmenty (tablice uint8 0/1).
+# Obsługiwane źródła:
+#   - ścieżka do pliku (str lub os.PathLike) lub plik otwarty w trybie binarnym (bajty, bity od najstarszego),
+#   - spakowane bity jako bytes/bytearray/memoryview (np. wynik bbs_bytes),
+#   - iterator/iterowalny obiekt zwracający pojedyncze bity (np. lista lub generator BBS).
+def iter_bit_chunks(source, chunk_bits=DEFAULT_CHUNK_BITS):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)  # spakowane bity (np. wynik bbs_bytes), nie ścieżka
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from iter_bit_chunks(f, chunk_bits)
+        return
+    if hasattr(source, "read"):
+        chunk_bytes = max(1, chunk_bits // 8)
+        while True:
+            data = source.read(chunk_bytes)
+            if not data:
+                return
+            yield np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    iterator = iter(source)
+    while True:
+        chunk = np.fromiter(islice(iterator, chunk_bits), dtype=np.uint8)
+        if chunk.size == 0:
+            return
+        yield chunk
+
+# Funkcja stream_fips_battery(source, chunk_bits, on_window) wykonuje baterię FIPS na każdym
+# kolejnym, rozłącznym oknie 20000 bitów ze źródła, zużywając stałą ilość pamięci.
+# Opcjonalna funkcja on_window(index, results) wywoływana jest po każdym oknie.
+# Zwraca słownik z liczbą okien, odsetkiem zdanych okien dla każdego testu
+# oraz odsetkiem okien, które nie przeszły co najmniej jednego testu.
+def stream_fips_battery(source, chunk_bits=DEFAULT_CHUNK_BITS, on_window=None):
+    window = FipsWindow()
+    windows = 0
+    failed_windows = 0
+    passed = {"single_bits": 0, "runs": 0, "long_runs": 0, "poker": 0}
+
+    for chunk in iter_bit_chunks(source, chunk_bits):
+        pos = 0
+        while pos < chunk.size:
+            take = min(WINDOW_BITS - window.nbits, chunk.size - pos)
+            window.update(chunk[pos:pos + take])
+            pos += take
+            if window.nbits == WINDOW_BITS:
+                results = window.finish()
+                for test, ok in results.items():
+                    passed[test] += ok
+                failed_windows += not all(results.values())
+                if on_window is not None:
+                    on_window(windows, results)
+                windows += 1
+                window.reset()
+
+    return {
+        "windows": windows,
+        "passed": passed,
+        "pass_rate": {test: (count / windows if windows else 0.0) for test, count in passed.items()},
+        "failed_windows": failed_windows,
+        "failure_rate": failed_windows / windows if windows else 0.0,
+        "leftover_bits": window.nbits,  # bity niepełnego okna na końcu strumienia (nietestowane)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Strumieniowa bateria testów FIPS 140-1 dla pliku z bitami.")
+    parser.add_argument("path", help="plik binarny z ciągiem bitów")
+    parser.add_argument("--chunk-bits", type=int, default=DEFAULT_CHUNK_BITS, help="rozmiar wczytywanego fragmentu w bitach")
+    args = parser.parse_args()
+
+    report = stream_fips_battery(args.path, args.chunk_bits)
+    print(f"Liczba okien {WINDOW_BITS}-bitowych: {report['windows']}")
+    for test, rate in report["pass_rate"].items():
+        print(f"  {test:<12}: {rate:.4%}")
+    print(f"Odsetek okien z błędem: {report['failure_rate']:.4%}")
+    if report["leftover_bits"]:
+        print(f"Pominięto {report['leftover_bits']} bitów niepełnego okna")
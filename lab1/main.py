@@ -1,11 +1,19 @@
 import random
 from collections import Counter
-import sympy as sp
 from math import gcd
 
+# gmpy2 jest opcjonalne - gdy jest dostępne, generator BBS liczy na liczbach mpz (GMP).
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
 # Funkcja generate_prime() generuje liczbę pierwszą z przedziału określonego przez indeksy,
 # wybierając tylko te liczby, które są postaci 4k+3 (czyli reszta z dzielenia przez 4 wynosi 3).
+# Do dużych modułów należy używać generate_blum_prime(bits).
 def generate_prime():
+    # sympy importujemy dopiero tutaj, aby nie spowalniać uruchamiania modułu.
+    import sympy as sp
     while True:
         # Losowo wybieramy indeks w przedziale od 10000 do 50000,
         # a sp.prime() zwraca liczbę pierwszą odpowiadającą temu indeksowi.
@@ -14,25 +22,240 @@ def generate_prime():
         if prime % 4 == 3:
             return prime
 
-# Funkcja bbs_generator(n, length) implementuje generator pseudolosowy Blum-Blum-Shub (BBS).
-# Parametry:
-#   - n: iloczyn dwóch liczb pierwszych (moduł),
-#   - length: liczba bitów do wygenerowania.
-def bbs_generator(n, length):
+# Zapamiętane tablice sita (małe liczby pierwsze) dla kolejnych granic sita.
+_SIEVE_CACHE = {}
+
+# Funkcja small_primes(limit, cache) zwraca listę nieparzystych liczb pierwszych mniejszych od limit
+# (sito Eratostenesa). Przy cache=True tablica jest liczona tylko raz dla danej granicy.
+def small_primes(limit=2000, cache=True):
+    if cache and limit in _SIEVE_CACHE:
+        return _SIEVE_CACHE[limit]
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    primes = [i for i in range(3, limit) if sieve[i]]
+    if cache:
+        _SIEVE_CACHE[limit] = primes
+    return primes
+
+# Funkcja _miller_rabin_rounds(bits) zwraca liczbę rund testu Millera-Rabina dla losowego
+# kandydata o danej długości (prawdopodobieństwo błędu poniżej 2^-100, wg FIPS 186-4, tabela C.3).
+def _miller_rabin_rounds(bits):
+    if bits >= 1536:
+        return 3
+    if bits >= 1024:
+        return 4
+    if bits >= 512:
+        return 7
+    return 40
+
+# Funkcja _sieve_table(limit, cache) zwraca pary (p, 4^(-1) mod p) dla małych liczb pierwszych p < limit,
+# używane przez sito w generate_blum_prime. Przy cache=True tablica jest liczona tylko raz.
+def _sieve_table(limit, cache=True):
+    key = ("table", limit)
+    if cache and key in _SIEVE_CACHE:
+        return _SIEVE_CACHE[key]
+    table = [(p, pow(4, -1, p)) for p in small_primes(limit, cache)]
+    if cache:
+        _SIEVE_CACHE[key] = table
+    return table
+
+# Funkcja _miller_rabin(n, rounds) wykonuje test Millera-Rabina dla nieparzystego n > 3.
+def _miller_rabin(n, rounds):
+    # Rozkład n-1 na d*2^r
+    d = n - 1
+    r = 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for i in range(rounds):
+        # Pierwsza podstawa to 2, kolejne są losowe.
+        a = 2 if i == 0 else random.randrange(2, n - 1)
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+# Funkcja is_probable_prime(n, rounds) - dzielenie przez małe liczby pierwsze, a następnie test Millera-Rabina.
+def is_probable_prime(n, rounds=None):
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    for p in small_primes():
+        if n % p == 0:
+            return n == p
+    if rounds is None:
+        rounds = _miller_rabin_rounds(n.bit_length())
+    return _miller_rabin(n, rounds)
+
+# Funkcja generate_blum_prime(bits, sieve_limit, window, cache) generuje liczbę pierwszą Bluma
+# (p % 4 == 3) o dokładnie bits bitach.
+# Kandydaci to kolejne liczby base, base+4, base+8, ... (wszystkie postaci 4k+3).
+# Dla okna window kandydatów sitem odrzucamy te podzielne przez małe liczby pierwsze p < sieve_limit,
+# a test Millera-Rabina wykonujemy tylko dla pozostałych.
+def generate_blum_prime(bits, sieve_limit=1 << 15, window=4096, cache=True):
+    if bits < 3:
+        raise ValueError("Liczba pierwsza Bluma musi mieć co najmniej 3 bity")
+    # Pomijamy liczby pierwsze, które mogłyby być równe samemu kandydatowi.
+    table = [(p, inv4) for p, inv4 in _sieve_table(sieve_limit, cache) if p.bit_length() < bits]
+    rounds = _miller_rabin_rounds(bits)
+    while True:
+        # Losowy start z ustawionym najstarszym bitem, postaci 4k+3.
+        base = random.getrandbits(bits) | (1 << (bits - 1)) | 3
+        limit = min(window, ((1 << bits) - 1 - base) // 4 + 1)
+        composite = bytearray(limit)
+        for p, inv4 in table:
+            # Pierwsze k, dla którego p dzieli base + 4k: k = -base * 4^(-1) mod p.
+            k = (-base * inv4) % p
+            if k < limit:
+                composite[k::p] = b"\x01" * len(range(k, limit, p))
+        for k in range(limit):
+            if not composite[k]:
+                candidate = base + 4 * k
+                if _miller_rabin(candidate, rounds):
+                    return candidate
+
+# Klasa BBSBackend opisuje arytmetykę używaną w pętli generatora BBS:
+#   - convert: zamiana liczby całkowitej na typ natywny backendu,
+#   - square_mod: funkcja (x, n) -> x^2 mod n.
+class BBSBackend:
+    def __init__(self, name, convert, square_mod):
+        self.name = name
+        self.convert = convert
+        self.square_mod = square_mod
+
+def _python_square_mod(x, n):
+    return pow(x, 2, n)
+
+def _gmpy2_square_mod(x, n):
+    # Dla mpz mnożenie i redukcja są szybsze niż gmpy2.powmod(x, 2, n).
+    return x * x % n
+
+BBS_BACKENDS = {"python": BBSBackend("python", int, _python_square_mod)}
+if gmpy2 is not None:
+    BBS_BACKENDS["gmpy2"] = BBSBackend("gmpy2", gmpy2.mpz, _gmpy2_square_mod)
+
+# Funkcja get_bbs_backend(backend) zwraca backend o podanej nazwie (lub sam obiekt BBSBackend).
+# Domyślnie wybierany jest gmpy2, jeśli jest zainstalowane, a w przeciwnym razie pow(x, 2, n).
+def get_bbs_backend(backend=None):
+    if isinstance(backend, BBSBackend):
+        return backend
+    if backend is None:
+        backend = "gmpy2" if "gmpy2" in BBS_BACKENDS else "python"
+    if backend not in BBS_BACKENDS:
+        raise ValueError(f"Nieznany lub niedostępny backend arytmetyki: {backend}")
+    return BBS_BACKENDS[backend]
+
+# Funkcja bbs_seed(n, seed) zwraca stan początkowy generatora BBS.
+# Bez podanego ziarna losujemy 16-bitową liczbę względnie pierwszą z n,
+# podane ziarno musi być względnie pierwsze z n.
+def bbs_seed(n, seed=None):
+    if seed is not None:
+        x = seed % n
+        if gcd(x, n) != 1:
+            raise ValueError("Ziarno musi być względnie pierwsze z n")
+        return x
     # Inicjujemy wartość początkową x losując 16-bitową liczbę.
     x = random.getrandbits(16)
     # Upewniamy się, że x jest względnie pierwsze z n (gcd(x, n) == 1),
     # aby zapewnić poprawne działanie generatora.
     while gcd(x, n) != 1:
         x = random.getrandbits(16)
+    return x
+
+# Funkcja bbs_generator(n, length) implementuje generator pseudolosowy Blum-Blum-Shub (BBS).
+# Parametry:
+#   - n: iloczyn dwóch liczb pierwszych (moduł),
+#   - length: liczba bitów do wygenerowania,
+#   - seed: opcjonalne ziarno (domyślnie losowe),
+#   - backend: backend arytmetyki (nazwa z BBS_BACKENDS, domyślnie najszybszy dostępny).
+def bbs_generator(n, length, seed=None, backend=None):
+    backend = get_bbs_backend(backend)
+    square_mod = backend.square_mod
+    x = backend.convert(bbs_seed(n, seed))
+    n = backend.convert(n)
     bits = []  # Lista na wygenerowane bity
     for _ in range(length):
         # Generujemy kolejny stan x poprzez podniesienie do kwadratu modulo n.
-        x = (x ** 2) % n
+        x = square_mod(x, n)
         # Pobieramy najmłodszy bit (bit najmniej znaczący) i dodajemy go do listy.
-        bits.append(x & 1)
+        bits.append(int(x & 1))
     return bits
 
+# Funkcja max_bits_per_step(n) zwraca liczbę najmłodszych bitów, które można bezpiecznie
+# pobrać z jednego stanu BBS: floor(log2(log2(n))).
+def max_bits_per_step(n):
+    return max(1, (int(n).bit_length() - 1).bit_length() - 1)
+
+# Funkcja check_bits_per_step(n, bits_per_step) zgłasza błąd, jeśli z jednego stanu BBS
+# miałoby być pobieranych mniej niż 1 lub więcej niż max_bits_per_step(n) bitów.
+def check_bits_per_step(n, bits_per_step):
+    limit = max_bits_per_step(n)
+    if not 1 <= bits_per_step <= limit:
+        raise ValueError(f"Liczba bitów na krok musi należeć do przedziału 1..{limit} dla tego modułu")
+
+# Funkcja bbs_stream(n, seed, bits_per_step) to leniwa (nieskończona) wersja generatora BBS.
+# Z każdego podniesienia do kwadratu zwraca bits_per_step najmłodszych bitów stanu,
+# od najstarszego z nich. Dla bits_per_step=1 daje ten sam ciąg co bbs_generator.
+def bbs_stream(n, seed=None, bits_per_step=1, backend=None):
+    # Sprawdzamy parametry od razu, a nie dopiero przy pobraniu pierwszego bitu z generatora.
+    check_bits_per_step(n, bits_per_step)
+    return _bbs_stream(n, seed, bits_per_step, backend)
+
+def _bbs_stream(n, seed, bits_per_step, backend):
+    backend = get_bbs_backend(backend)
+    square_mod = backend.square_mod
+    x = backend.convert(bbs_seed(n, seed))
+    n = backend.convert(n)
+    mask = (1 << bits_per_step) - 1
+    shifts = range(bits_per_step - 1, -1, -1)
+    while True:
+        x = square_mod(x, n)
+        low = int(x & mask)
+        for shift in shifts:
+            yield (low >> shift) & 1
+
+# Funkcja bbs_fill(n, out, seed, bits_per_step) wypełnia zapisywalny bufor out (np. bytearray,
+# memoryview fragmentu pamięci współdzielonej) bajtami z generatora BBS, bez tworzenia kopii.
+# Bity są pakowane od najstarszego bitu bajtu (ta sama kolejność co np.packbits i bbs_stream).
+# 64 kolejne kroki dają zawsze 8 * bits_per_step pełnych bajtów, więc bity gromadzimy
+# w jednej liczbie na blok zamiast w liście pojedynczych bitów.
+def bbs_fill(n, out, seed=None, bits_per_step=1, backend=None):
+    check_bits_per_step(n, bits_per_step)
+    backend = get_bbs_backend(backend)
+    square_mod = backend.square_mod
+    x = backend.convert(bbs_seed(n, seed))
+    n = backend.convert(n)
+    mask = (1 << bits_per_step) - 1
+    block_bytes = 8 * bits_per_step
+    with memoryview(out) as view:
+        nbytes = len(view)
+        position = 0
+        while position < nbytes:
+            block = 0
+            for _ in range(64):
+                x = square_mod(x, n)
+                block = (block << bits_per_step) | (x & mask)
+            end = min(position + block_bytes, nbytes)
+            # Ostatni blok może zawierać nadmiarowe bajty, które odrzucamy.
+            view[position:end] = int(block).to_bytes(block_bytes, 'big')[:end - position]
+            position = end
+
+# Funkcja bbs_bytes(n, nbytes, seed, bits_per_step) generuje nbytes bajtów z generatora BBS.
+def bbs_bytes(n, nbytes, seed=None, bits_per_step=1, backend=None):
+    out = bytearray(nbytes)
+    bbs_fill(n, out, seed, bits_per_step, backend)
+    return bytes(out)
+
 # Funkcja single_bits_test(bits) sprawdza, czy liczba jedynek w ciągu bitów mieści się w zadanym przedziale.
 # Zakłada się, że dla idealnego ciągu o długości 20000 bitów liczba jedynek powinna być bliska 20000/2.
 def single_bits_test(bits):
@@ -119,11 +342,11 @@ def poker_test(bits):
     return 2.16 <= x <= 46.17
 
 if __name__ == "__main__":
-    # Ustalamy długość bitów (choć zmienna bit_length nie jest bezpośrednio używana dalej)
-    bit_length = 16
+    # Ustalamy długość bitów liczb pierwszych p i q.
+    bit_length = 512
     # Generujemy dwie liczby pierwsze p i q spełniające warunek p % 4 == 3.
-    p = generate_prime()
-    q = generate_prime()
+    p = generate_blum_prime(bit_length)
+    q = generate_blum_prime(bit_length)
     print("p:", p)
     print("q:", q)
     # Obliczamy moduł n jako iloczyn dwóch liczb pierwszych.
@@ -0,0 +1,236 @@
+import argparse
+import math
+
+import numpy as np
+
+from fips import unpack_bits
+
+# Moduł zawiera wybrane testy statystyczne z NIST SP 800-22 (rev. 1a), uzupełniające baterię FIPS 140-1.
+# Testy przyjmują to samo źródło bitów co fips.py: spakowaną tablicę (uint8/uint64) i liczbę bitów nbits.
+# Każdy test zwraca p-wartość (lub krotkę p-wartości); ciąg uznaje się za losowy, gdy p >= 0.01.
+
+ALPHA = 0.01
+
+# =====================================================================
+# Funkcje pomocnicze (niepełna funkcja gamma, dystrybuanta rozkładu normalnego)
+# =====================================================================
+
+# Funkcja igamc(a, x) zwraca uzupełnioną, znormalizowaną niepełną funkcję gamma Q(a, x)
+# (szereg dla x < a + 1, w przeciwnym razie ułamek łańcuchowy metodą Lentza).
+def igamc(a, x):
+    if a <= 0 or x < 0:
+        raise ValueError("igamc wymaga a > 0 oraz x >= 0")
+    if x == 0:
+        return 1.0
+    log_prefactor = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        ap = a
+        while abs(term) > abs(total) * 1e-15:
+            ap += 1
+            term *= x / ap
+            total += term
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    i = 0
+    while True:
+        i += 1
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefactor) * h
+
+# Funkcja normal_cdf(x) - dystrybuanta standardowego rozkładu normalnego.
+def normal_cdf(x):
+    return 0.5 * math.erfc(-x / math.sqrt(2))
+
+# Funkcja _trunc_div(a, b) - dzielenie całkowite z obcięciem w stronę zera (jak w implementacji referencyjnej NIST w C).
+def _trunc_div(a, b):
+    q = abs(a) // b
+    return q if a >= 0 else -q
+
+# Funkcja _as_pm1(bits) zamienia bity 0/1 na wartości -1/+1.
+def _as_pm1(bits):
+    return 2 * bits.astype(np.int8) - 1
+
+# Funkcja pattern_counts(bits, m) zlicza wszystkie nakładające się (cyklicznie) wzorce m-bitowe.
+def pattern_counts(bits, m):
+    n = bits.size
+    if m == 0:
+        return np.array([n], dtype=np.int64)
+    extended = np.concatenate((bits, bits[:m - 1])).astype(np.uint32)
+    values = np.zeros(n, dtype=np.uint32)
+    for j in range(m):
+        values = (values << 1) | extended[j:j + n]
+    return np.bincount(values, minlength=1 << m)
+
+# =====================================================================
+# Testy
+# =====================================================================
+
+# Test częstości w blokach (Frequency Test within a Block), długość bloku M.
+def block_frequency_test(packed, nbits=None, M=128):
+    bits = unpack_bits(packed, nbits)
+    N = bits.size // M
+    if N == 0:
+        raise ValueError("Ciąg jest krótszy niż jeden blok")
+    proportions = bits[:N * M].reshape(N, M).sum(axis=1, dtype=np.int64) / M
+    chi_squared = 4 * M * float(np.sum((proportions - 0.5) ** 2))
+    return igamc(N / 2, chi_squared / 2)
+
+# Test sum skumulowanych (Cumulative Sums), mode=0 - w przód, mode=1 - wstecz.
+def cumulative_sums_test(packed, nbits=None, mode=0):
+    x = _as_pm1(unpack_bits(packed, nbits))
+    if mode:
+        x = x[::-1]
+    n = x.size
+    z = int(np.max(np.abs(np.cumsum(x, dtype=np.int64))))
+    if z == 0:
+        return 0.0
+    sqrt_n = math.sqrt(n)
+    total = 1.0
+    upper = _trunc_div(n // z - 1, 4)
+    for k in range(_trunc_div(-(n // z) + 1, 4), upper + 1):
+        total -= normal_cdf((4 * k + 1) * z / sqrt_n) - normal_cdf((4 * k - 1) * z / sqrt_n)
+    for k in range(_trunc_div(-(n // z) - 3, 4), upper + 1):
+        total += normal_cdf((4 * k + 3) * z / sqrt_n) - normal_cdf((4 * k + 1) * z / sqrt_n)
+    return min(1.0, max(0.0, total))
+
+# Test entropii przybliżonej (Approximate Entropy), długość wzorca m.
+def approximate_entropy_test(packed, nbits=None, m=10):
+    bits = unpack_bits(packed, nbits)
+    n = bits.size
+
+    def phi(k):
+        counts = pattern_counts(bits, k)
+        counts = counts[counts > 0] / n
+        return float(np.sum(counts * np.log(counts)))
+
+    ap_en = phi(m) - phi(m + 1)
+    chi_squared = 2 * n * (math.log(2) - ap_en)
+    return igamc(2 ** (m - 1), chi_squared / 2)
+
+# Test seryjny (Serial), długość wzorca m. Zwraca dwie p-wartości.
+def serial_test(packed, nbits=None, m=16):
+    bits = unpack_bits(packed, nbits)
+    n = bits.size
+
+    def psi_squared(k):
+        if k <= 0:
+            return 0.0
+        counts = pattern_counts(bits, k).astype(np.float64)
+        return (2 ** k / n) * float(np.dot(counts, counts)) - n
+
+    psi_m, psi_m1, psi_m2 = psi_squared(m), psi_squared(m - 1), psi_squared(m - 2)
+    delta1 = psi_m - psi_m1
+    delta2 = psi_m - 2 * psi_m1 + psi_m2
+    return igamc(2 ** (m - 2), delta1 / 2), igamc(2 ** (m - 3), delta2 / 2)
+
+# Test spektralny (Discrete Fourier Transform), liczony przez FFT.
+def dft_spectral_test(packed, nbits=None):
+    x = _as_pm1(unpack_bits(packed, nbits)).astype(np.float64)
+    n = x.size
+    modulus = np.abs(np.fft.rfft(x)[:n // 2])
+    threshold = math.sqrt(math.log(1 / 0.05) * n)
+    n0 = 0.95 * n / 2
+    n1 = int(np.count_nonzero(modulus < threshold))
+    d = (n1 - n0) / math.sqrt(n * 0.95 * 0.05 / 4)
+    return math.erfc(abs(d) / math.sqrt(2))
+
+# Funkcja linear_complexities(blocks) wyznacza złożoność liniową każdego wiersza macierzy bitów
+# (N bloków x M bitów) algorytmem Berlekampa-Masseya wykonywanym jednocześnie dla wszystkich bloków.
+# Wielomiany są przechowywane "w poprzek bloków": słowo uint64 zawiera ten sam współczynnik
+# dla 64 różnych bloków, więc każdy krok algorytmu to kilka operacji na tablicach słów.
+def linear_complexities(blocks):
+    N, M = blocks.shape
+    words = (N + 63) // 64
+
+    def slice_bits(rows):
+        padded = np.zeros((rows.shape[0], words * 64), dtype=np.uint8)
+        padded[:, :N] = rows
+        return np.packbits(padded, axis=1, bitorder='little').view(np.uint64)
+
+    def to_mask(flags):
+        return slice_bits(flags[np.newaxis, :].astype(np.uint8))[0]
+
+    s = slice_bits(blocks.T)  # s[j] - j-ty bit każdego bloku
+    c = np.zeros((M + 1, words), dtype=np.uint64)  # wielomiany połączeń C(x)
+    b = np.zeros((M + 1, words), dtype=np.uint64)  # x^(t-m) * B(x)
+    c[0] = ~np.uint64(0)
+    b[1] = ~np.uint64(0)
+    lengths = np.zeros(N, dtype=np.int64)
+
+    for t in range(M):
+        # Rozbieżność d = s_t + sum c_i * s_(t-i) (nad GF(2)).
+        d = np.bitwise_xor.reduce(c[:t + 1] & s[t::-1], axis=0)
+        d_flags = np.unpackbits(d.view(np.uint8), bitorder='little')[:N].astype(bool)
+        update = d_flags & (2 * lengths <= t)
+        update_mask = to_mask(update)
+        previous = c.copy()
+        c ^= b & d
+        # Tam, gdzie rośnie złożoność, B staje się poprzednim C; następnie całość mnożymy przez x.
+        b = (previous & update_mask) | (b & ~update_mask)
+        b[1:] = b[:-1].copy()
+        b[0] = 0
+        lengths = np.where(update, t + 1 - lengths, lengths)
+    return lengths
+
+# Test złożoności liniowej (Linear Complexity), długość bloku M.
+def linear_complexity_test(packed, nbits=None, M=500):
+    bits = unpack_bits(packed, nbits)
+    N = bits.size // M
+    if N == 0:
+        raise ValueError("Ciąg jest krótszy niż jeden blok")
+    lengths = linear_complexities(bits[:N * M].reshape(N, M))
+
+    mu = M / 2 + (9 + (-1) ** (M + 1)) / 36 - (M / 3 + 2 / 9) / 2 ** M
+    t = (-1) ** M * (lengths - mu) + 2 / 9
+    edges = [-np.inf, -2.5, -1.5, -0.5, 0.5, 1.5, 2.5, np.inf]
+    counts = np.histogram(t, bins=edges)[0]
+    pi = np.array([0.010417, 0.03125, 0.125, 0.5, 0.25, 0.0625, 0.020833])
+    chi_squared = float(np.sum((counts - N * pi) ** 2 / (N * pi)))
+    return igamc(3, chi_squared / 2)
+
+# Funkcja nist_battery(packed, nbits) wykonuje wszystkie testy i zwraca słownik p-wartości.
+def nist_battery(packed, nbits=None):
+    serial_p1, serial_p2 = serial_test(packed, nbits)
+    return {
+        "block_frequency": block_frequency_test(packed, nbits),
+        "cumulative_sums_forward": cumulative_sums_test(packed, nbits, mode=0),
+        "cumulative_sums_backward": cumulative_sums_test(packed, nbits, mode=1),
+        "approximate_entropy": approximate_entropy_test(packed, nbits),
+        "serial_1": serial_p1,
+        "serial_2": serial_p2,
+        "dft_spectral": dft_spectral_test(packed, nbits),
+        "linear_complexity": linear_complexity_test(packed, nbits),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Testy NIST SP 800-22 dla ciągu z generatora BBS lub z pliku.")
+    parser.add_argument("path", nargs="?", help="plik binarny z ciągiem bitów (domyślnie generator BBS)")
+    parser.add_argument("--bits", type=int, default=1000000, help="liczba bitów generowanych przez BBS")
+    args = parser.parse_args()
+
+    if args.path:
+        packed = np.fromfile(args.path, dtype=np.uint8)
+    else:
+        from main import bbs_bytes, generate_blum_prime
+        n = generate_blum_prime(256) * generate_blum_prime(256)
+        packed = np.frombuffer(bbs_bytes(n, args.bits // 8), dtype=np.uint8)
+
+    print(f"Liczba bitów: {packed.size * 8}")
+    for test, p_value in nist_battery(packed).items():
+        verdict = "OK" if p_value >= ALPHA else "BŁĄD"
+        print(f"  {test:<26}: p = {p_value:.6f} {verdict}")
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from main import bbs_fill, generate_blum_prime
+
+# Moduł uruchamia wiele niezależnych generatorów BBS (po jednym na sesję) równolegle
+# w osobnych procesach. Każdy proces generuje swój strumień bezpośrednio w swoim wierszu
+# wspólnego, wcześniej zaalokowanego bufora w pamięci współdzielonej (bez kopii pośrednich),
+# a zwracana tablica to widok tego samego bufora.
+
+# Funkcja derive_seeds(n, master_seed, count) wyprowadza deterministycznie count ziaren
+# z ziarna głównego (SHA-256 z ziarna głównego i numeru strumienia).
+# Każde ziarno jest względnie pierwsze z n.
+def derive_seeds(n, master_seed, count):
+    seeds = []
+    for index in range(count):
+        digest = hashlib.sha256(f"{master_seed}:{index}".encode('utf-8')).digest()
+        x = int.from_bytes(digest, 'big') % n
+        while x < 2 or gcd(x, n) != 1:
+            x = (x + 1) % n
+        seeds.append(x)
+    return seeds
+
+# Funkcja _fill_stream(task) wykonywana jest w procesie roboczym - generuje jeden strumień
+# i zapisuje go w swoim wierszu bufora współdzielonego.
+def _fill_stream(task):
+    shm_name, index, n, seed, nbytes, bits_per_step = task
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        with shm.buf[index * nbytes:(index + 1) * nbytes] as row:
+            bbs_fill(n, row, seed, bits_per_step)
+    finally:
+        shm.close()
+    return index
+
+# Funkcja generate_streams(pairs, nbytes, bits_per_step, workers) generuje po nbytes bajtów
+# dla każdej pary (n, seed) i zwraca tablicę uint8 o kształcie (liczba par, nbytes).
+# Wynik zależy wyłącznie od par (n, seed), a nie od liczby procesów ani kolejności ich pracy.
+# Tablica jest widokiem pamięci współdzielonej - segment jest zamykany, gdy tablica
+# (i wszystkie jej widoki) przestaną być używane.
+def generate_streams(pairs, nbytes, bits_per_step=1, workers=None):
+    pairs = list(pairs)
+    if not pairs or nbytes == 0:
+        return np.zeros((len(pairs), nbytes), dtype=np.uint8)
+
+    shm = shared_memory.SharedMemory(create=True, size=len(pairs) * nbytes)
+    try:
+        tasks = [(shm.name, index, n, seed, nbytes, bits_per_step) for index, (n, seed) in enumerate(pairs)]
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            # Każde zadanie to jeden strumień, więc kolejne wolne procesy pobierają kolejne strumienie.
+            for _ in executor.map(_fill_stream, tasks):
+                pass
+    except BaseException:
+        shm.close()
+        raise
+    finally:
+        # Nazwa segmentu nie jest już potrzebna; samo mapowanie pozostaje ważne do zamknięcia.
+        shm.unlink()
+    streams = np.ndarray((len(pairs), nbytes), dtype=np.uint8, buffer=shm.buf)
+    weakref.finalize(streams, shm.close)
+    return streams
+
+# Funkcja generate_streams_from_master(n, master_seed, count, nbytes, ...) generuje count strumieni
+# dla wspólnego modułu n, z ziarnami wyprowadzonymi z ziarna głównego.
+def generate_streams_from_master(n, master_seed, count, nbytes, bits_per_step=1, workers=None):
+    pairs = [(n, seed) for seed in derive_seeds(n, master_seed, count)]
+    return generate_streams(pairs, nbytes, bits_per_step, workers)
+
+if __name__ == "__main__":
+    p = generate_blum_prime(64)
+    q = generate_blum_prime(64)
+    n = p * q
+    count = 32
+    nbytes = 64 * 1024
+    print(f"n = {n}, strumieni: {count}, bajtów na strumień: {nbytes}")
+
+    reference = None
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        streams = generate_streams_from_master(n, master_seed=2024, count=count, nbytes=nbytes, workers=workers)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = streams
+        assert np.array_equal(reference, streams)
+        print(f"Procesy: {workers:<3} czas: {elapsed:.3f} s, przepustowość: {count * nbytes / elapsed / 1e6:.3f} MB/s")
@@ -1,35 +1,56 @@
 #algorytm Diffiego-Hellmana
 
-import math
 import random
 
-def generate_prime():
-    while True:
-        n = random.randint(1000, 999999)
-        if is_prime(n):
-            return n
-
-def is_prime(n):
-    if n < 2:
-        return False
-    for i in range(2, math.isqrt(n) + 1):
-        if n % i == 0:
-            return False
-    return True
-
-def find_primitive(n):
-    required_set = set(range(1, n)) #zbiór {1, 2, ..., n-1}
-    for g in range(2, n): 
-        actual_set = set(pow(g, i, n) for i in range(1, n))
-        if required_set == actual_set:
+from primes import factorize, generate_safe_prime, is_prime, jacobi, random_prime, random_prime_in_range
+
+#2048-bitowa grupa MODP nr 14 z RFC 3526 - bezpieczna liczba pierwsza p = 2q + 1
+RFC3526_GROUP14 = int(
+    "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD1"
+    "29024E088A67CC74020BBEA63B139B22514A08798E3404DD"
+    "EF9519B3CD3A431B302B0A6DF25F14374FE1356D6D51C245"
+    "E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED"
+    "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3D"
+    "C2007CB8A163BF0598DA48361C55D39A69163FA8FD24CF5F"
+    "83655D23DCA3AD961C62F356208552BB9ED529077096966D"
+    "670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B"
+    "E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9"
+    "DE2BCBF6955817183995497CEA956AE515D2261898FA0510"
+    "15728E5A8AACAA68FFFFFFFFFFFFFFFF", 16)
+
+def generate_prime(bits=None):
+    if bits is None:
+        return random_prime_in_range(1000, 999999) #domyślnie liczby do sześciu cyfr
+    return random_prime(bits) #np. bits=3072 dla grupy DH
+
+def find_primitive(n, factors=None):
+    if factors is None:
+        factors = factorize(n - 1) #czynniki pierwsze rzędu grupy n-1
+    for g in range(2, n):
+        #g jest pierwiastkiem pierwotnym, gdy g^((n-1)/q) != 1 (mod n) dla każdego czynnika pierwszego q
+        if all(pow(g, (n - 1) // q, n) != 1 for q in factors):
             return g
     raise ValueError("Nie znaleziono pierwiastka pierwotnego")
+
+def find_primitive_safe(p):
+    #dla p = 2q + 1 rozkład p-1 jest znany: g (1 < g < p-1) jest pierwiastkiem pierwotnym
+    #dokładnie wtedy, gdy g^q = -1 (mod p), czyli gdy g jest nieresztą kwadratową (symbol Jacobiego -1)
+    for g in range(2, p - 1):
+        if jacobi(g, p) == -1:
+            return g
+    raise ValueError("Nie znaleziono pierwiastka pierwotnego")
+
+def generate_safe_group(bits):
+    p = generate_safe_prime(bits)
+    return p, find_primitive_safe(p)
         
-def diffie_helmann(n, g):
+def diffie_helmann(n, g, table=None):
+    #table - opcjonalna prekomputowana tablica FixedBaseExp(g, n), wielokrotnie używana w kolejnych wymianach
+    public = table.pow if table is not None else (lambda e: pow(g, e, n))
     x = random.randint(1000, n)
-    X = pow(g, x, n)
+    X = public(x)
     y = random.randint(1000, n)
-    Y = pow(g, y, n)
+    Y = public(y)
     print(f"Wartość X: {X}")
     print(f"Wartość Y: {Y}")
     shared_key_A = pow(Y, x, n)
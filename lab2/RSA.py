@@ -3,17 +3,20 @@
 import math
 import random
 
-def generate_prime():
-    while True:
-        n = random.randint(1000, 9999) #tylko liczby czterocyfrowe
-        if is_prime(n):
-            return n
+from primes import is_prime, random_prime, random_prime_in_range
+
+def generate_prime(bits=None):
+    if bits is None:
+        return random_prime_in_range(1000, 9999) #domyślnie tylko liczby czterocyfrowe
+    return random_prime(bits) #np. bits=1024 dla klucza RSA-2048
         
-def generate_two_primes():
-    p = generate_prime()
-    q = generate_prime()
-    while abs(p - q) < 3000: #minimalna różnica między p i q wynosi 3000
-        q = generate_prime()
+def generate_two_primes(bits=None):
+    #minimalna różnica między p i q wynosi 3000, a dla dużych liczb 2^(bits-100) (FIPS 186-4)
+    min_diff = 3000 if bits is None else 1 << max(0, bits - 100)
+    p = generate_prime(bits)
+    q = generate_prime(bits)
+    while abs(p - q) < min_diff:
+        q = generate_prime(bits)
     return p, q
 
 def generate_e(phi):
@@ -26,24 +29,124 @@ def generate_d(e, phi):
     return pow(e, -1, phi)
         
 
-def is_prime(n):
-    if n < 2:
-        return False
-    for i in range(2, math.isqrt(n) + 1):
-        if n % i == 0:
-            return False
-    return True
+class RSAPrivateKey:
+    """Klucz prywatny z parametrami CRT: dP = d mod (p-1), dQ = d mod (q-1), qInv = q^-1 mod p."""
+
+    def __init__(self, p: int, q: int, d: int):
+        self.p = p
+        self.q = q
+        self.d = d
+        self.n = p * q
+        self.dP = d % (p - 1)
+        self.dQ = d % (q - 1)
+        self.qInv = pow(q, -1, p)
+
+    @classmethod
+    def from_primes(cls, p: int, q: int, e: int) -> "RSAPrivateKey":
+        return cls(p, q, generate_d(e, (p - 1) * (q - 1)))
+
+    def decrypt_int(self, c: int) -> int:
+        #dwa potęgowania o połowę krótszych liczb zamiast jednego pow(c, d, n) - twierdzenie chińskie o resztach
+        m1 = pow(c, self.dP, self.p)
+        m2 = pow(c, self.dQ, self.q)
+        h = self.qInv * (m1 - m2) % self.p
+        return m2 + h * self.q
+
+    def as_tuple(self) -> tuple[int,int]:
+        return self.d, self.n
+
+def private_pow(private_key):
+    """Zwraca krotkę (funkcja c -> c^d mod n, moduł n); funkcja to ścieżka CRT dla RSAPrivateKey lub zwykłe pow dla krotki (d, n)."""
+    if isinstance(private_key, RSAPrivateKey):
+        return private_key.decrypt_int, private_key.n
+    d, n = private_key
+    return (lambda c: pow(c, d, n)), n
 
 def encrypt(message: str, public_key: tuple[int,int]) -> list[int]:
     e, n = public_key
     message_bytes = message.encode('utf-8') #każdy bajt z przedziału 0-255, więc na pewno jest mniejszy od n, bo n = p*q (obie to liczby czterocyfrowe)
     return [pow(b, e, n) for b in message_bytes] #dla każdego bajtu c = b^e mod n
 
-def decrypt(cipher: list[int], private_key: tuple[int,int]) -> str:
-    d, n = private_key
-    decrypted_bytes = [pow(c, d, n) for c in cipher] #dla każdego bajtu m = c^d mod n
+def decrypt(cipher: list[int], private_key: "tuple[int,int] | RSAPrivateKey") -> str:
+    decrypt_int, n = private_pow(private_key)
+    decrypted_bytes = [decrypt_int(c) for c in cipher] #dla każdego bajtu m = c^d mod n
     return bytes(decrypted_bytes).decode('utf-8') #odtworzenie oryginalnej wiadomości i dekod do utf-8
 
+#tryb blokowy - w jednej liczbie m < n mieści się tyle bajtów, ile pozwala rozmiar n
+
+STREAM_CHUNK_SIZE = 1 << 16 #rozmiar fragmentu czytanego z pliku w trybie strumieniowym
+
+def plain_block_size(n: int) -> int:
+    return (n.bit_length() - 1) // 8 #k bajtów: 256^k <= 2^(bity n - 1) < n
+
+def cipher_block_size(n: int) -> int:
+    return (n.bit_length() + 7) // 8 #szyfrogram c < n zapisany na stałej liczbie bajtów
+
+def _pad(data: bytes, k: int) -> bytes:
+    padded = data + b"\x80" #dopełnienie ISO/IEC 7816-4: bajt 0x80 i zera do pełnego bloku
+    return padded + bytes(-len(padded) % k)
+
+def _unpad(data: bytes) -> bytes:
+    data = data.rstrip(b"\x00")
+    if not data.endswith(b"\x80"):
+        raise ValueError("Niepoprawne dopełnienie ostatniego bloku")
+    return data[:-1]
+
+def encrypt_chunks(chunks, public_key: tuple[int,int]):
+    """Szyfruje kolejne fragmenty tekstu jawnego (bytes) i zwraca kolejne bloki szyfrogramu."""
+    e, n = public_key
+    k, w = plain_block_size(n), cipher_block_size(n)
+    if k < 1:
+        raise ValueError("Moduł n jest za mały dla trybu blokowego")
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        full = len(buffer) - len(buffer) % k
+        for i in range(0, full, k):
+            m = int.from_bytes(buffer[i:i + k], 'big')
+            yield pow(m, e, n).to_bytes(w, 'big')
+        buffer = buffer[full:] #niepełny blok czeka na kolejny fragment
+    buffer = _pad(buffer, k)
+    for i in range(0, len(buffer), k):
+        yield pow(int.from_bytes(buffer[i:i + k], 'big'), e, n).to_bytes(w, 'big')
+
+def decrypt_chunks(chunks, private_key: "tuple[int,int] | RSAPrivateKey"):
+    """Odszyfrowuje kolejne fragmenty szyfrogramu (bytes) i zwraca kolejne bloki tekstu jawnego."""
+    decrypt_int, n = private_pow(private_key)
+    k, w = plain_block_size(n), cipher_block_size(n)
+    buffer = b""
+    last = None #ostatni blok jest wstrzymywany do końca danych, bo zawiera dopełnienie
+    for chunk in chunks:
+        buffer += chunk
+        full = len(buffer) - len(buffer) % w
+        for i in range(0, full, w):
+            if last is not None:
+                yield last
+            last = decrypt_int(int.from_bytes(buffer[i:i + w], 'big')).to_bytes(k, 'big')
+        buffer = buffer[full:]
+    if buffer or last is None:
+        raise ValueError("Długość szyfrogramu nie jest wielokrotnością rozmiaru bloku")
+    yield _unpad(last)
+
+def encrypt_blocks(data: bytes, public_key: tuple[int,int]) -> bytes:
+    return b"".join(encrypt_chunks([data], public_key))
+
+def decrypt_blocks(cipher: bytes, private_key: "tuple[int,int] | RSAPrivateKey") -> bytes:
+    return b"".join(decrypt_chunks([cipher], private_key))
+
+def _read_chunks(src, chunk_size: int):
+    while chunk := src.read(chunk_size):
+        yield chunk
+
+def encrypt_stream(src, dst, public_key: tuple[int,int], chunk_size: int = STREAM_CHUNK_SIZE):
+    """Szyfruje plik src (otwarty binarnie) do dst, trzymając w pamięci tylko jeden fragment."""
+    for block in encrypt_chunks(_read_chunks(src, chunk_size), public_key):
+        dst.write(block)
+
+def decrypt_stream(src, dst, private_key: "tuple[int,int] | RSAPrivateKey", chunk_size: int = STREAM_CHUNK_SIZE):
+    for block in decrypt_chunks(_read_chunks(src, chunk_size), private_key):
+        dst.write(block)
+
 
 
 if __name__ == "__main__":
@@ -66,4 +169,9 @@ if __name__ == "__main__":
     print("Zaszyfrowana wiadomość:", cipher)
     decrypted_message = decrypt(cipher, private_key)
     print("Odszyfrowana wiadomość:", decrypted_message)
+    cipher_blocks = encrypt_blocks(message.encode('utf-8'), public_key)
+    print("Szyfrogram w trybie blokowym:", cipher_blocks.hex())
+    print("Odszyfrowana wiadomość (tryb blokowy):", decrypt_blocks(cipher_blocks, private_key).decode('utf-8'))
+    crt_key = RSAPrivateKey(p, q, d)
+    print("Odszyfrowana wiadomość (CRT):", decrypt_blocks(cipher_blocks, crt_key).decode('utf-8'))
 
@@ -0,0 +1,34 @@
+#porównanie deszyfrowania RSA: zwykłe pow(c, d, n) i CRT z RSAPrivateKey
+
+import random
+import time
+
+from RSA import RSAPrivateKey, generate_two_primes
+
+KEY_SIZES = [1024, 2048, 3072, 4096]
+E = 65537
+
+def generate_key(bits: int) -> RSAPrivateKey:
+    while True:
+        p, q = generate_two_primes(bits // 2)
+        if (p - 1) % E and (q - 1) % E: #e (liczba pierwsza) musi być odwracalne modulo phi
+            return RSAPrivateKey.from_primes(p, q, E)
+
+def benchmark(key: RSAPrivateKey, repetitions: int) -> tuple[float, float]:
+    ciphers = [pow(random.randrange(2, key.n), E, key.n) for _ in range(repetitions)]
+    start = time.perf_counter()
+    plain = [pow(c, key.d, key.n) for c in ciphers]
+    plain_time = (time.perf_counter() - start) / repetitions
+    start = time.perf_counter()
+    crt = [key.decrypt_int(c) for c in ciphers]
+    crt_time = (time.perf_counter() - start) / repetitions
+    assert plain == crt
+    return plain_time, crt_time
+
+if __name__ == "__main__":
+    print(f"{'Klucz [bit]':<12} | {'pow [ms]':<10} | {'CRT [ms]':<10} | {'Przyspieszenie':<14}")
+    print("-" * 56)
+    for bits in KEY_SIZES:
+        key = generate_key(bits)
+        plain_time, crt_time = benchmark(key, repetitions=max(5, 200 * 1024 // bits // 4))
+        print(f"{bits:<12} | {plain_time * 1000:<10.3f} | {crt_time * 1000:<10.3f} | {plain_time / crt_time:<14.2f}")
@@ -0,0 +1,112 @@
+#symulator wielu równoczesnych wymian kluczy Diffiego-Hellmana (asyncio + pula wykonawców)
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from DH import RFC3526_GROUP14, find_primitive_safe, generate_safe_group
+
+def _modexp(base: int, exponent: int, modulus: int) -> int:
+    return pow(base, exponent, modulus)
+
+class Party:
+    """Uczestnik symulacji - odbiera propozycje wymiany kluczy ze swojej kolejki i na nie odpowiada."""
+
+    def __init__(self, party_id: int, p: int, g: int, executor):
+        self.party_id = party_id
+        self.p = p
+        self.g = g
+        self.executor = executor
+        self.inbox = asyncio.Queue()
+
+    async def _power(self, base: int, exponent: int) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _modexp, base, exponent, self.p) #potęgowanie poza pętlą zdarzeń
+
+    async def serve(self):
+        while True:
+            X, reply = await self.inbox.get()
+            y = random.randrange(2, self.p - 1)
+            Y = await self._power(self.g, y)
+            await reply.put(Y)
+            shared = await self._power(X, y)
+            await reply.put(shared) #klucz odpowiadającego - tylko do weryfikacji poprawności symulacji
+
+    async def handshake(self, other: "Party") -> float:
+        """Wymiana kluczy z innym uczestnikiem; zwraca czas trwania w sekundach."""
+        start = time.perf_counter()
+        reply = asyncio.Queue()
+        x = random.randrange(2, self.p - 1)
+        X = await self._power(self.g, x)
+        await other.inbox.put((X, reply))
+        Y = await reply.get()
+        shared = await self._power(Y, x)
+        assert shared == await reply.get()
+        return time.perf_counter() - start
+
+async def run_simulation(n_parties: int, handshakes_per_party: int, p: int, g: int, executor) -> dict:
+    if n_parties < 2:
+        raise ValueError("Symulacja wymaga co najmniej dwóch uczestników")
+    if handshakes_per_party < 1:
+        raise ValueError("Każdy uczestnik musi zainicjować co najmniej jedną wymianę")
+    parties = [Party(i, p, g, executor) for i in range(n_parties)]
+    servers = [asyncio.create_task(party.serve()) for party in parties]
+
+    async def initiate(party: Party) -> list[float]:
+        latencies = []
+        for _ in range(handshakes_per_party):
+            other = random.choice([o for o in parties if o is not party])
+            latencies.append(await party.handshake(other))
+        return latencies
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(initiate(party) for party in parties))
+    elapsed = time.perf_counter() - start
+    for server in servers:
+        server.cancel()
+    await asyncio.gather(*servers, return_exceptions=True)
+
+    latencies = sorted(latency for party_latencies in results for latency in party_latencies)
+    if len(latencies) >= 2:
+        percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    else:
+        percentiles = latencies * 99  # quantiles wymaga co najmniej dwóch pomiarów
+    return {
+        "parties": n_parties,
+        "handshakes": len(latencies),
+        "handshakes_per_second": len(latencies) / elapsed,
+        "p50": percentiles[49],
+        "p90": percentiles[89],
+        "p99": percentiles[98],
+        "max": latencies[-1],
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test obciążeniowy wymiany kluczy Diffiego-Hellmana.")
+    parser.add_argument("--bits", type=int, default=512, help="rozmiar bezpiecznej liczby pierwszej (0 - grupa 2048-bitowa z RFC 3526)")
+    parser.add_argument("--parties", type=int, nargs="+", default=[2, 4, 8, 16, 32], help="liczby uczestników")
+    parser.add_argument("--handshakes", type=int, default=10, help="liczba wymian inicjowanych przez każdego uczestnika")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process", help="rodzaj puli do potęgowania")
+    args = parser.parse_args()
+    if min(args.parties) < 2:
+        parser.error("liczba uczestników musi wynosić co najmniej 2")
+    if args.handshakes < 1:
+        parser.error("liczba wymian musi wynosić co najmniej 1")
+
+    if args.bits:
+        p, g = generate_safe_group(args.bits)
+    else:
+        p = RFC3526_GROUP14
+        g = find_primitive_safe(p)
+
+    executor_class = ProcessPoolExecutor if args.executor == "process" else ThreadPoolExecutor
+    with executor_class() as executor:
+        print(f"{'N':<5} | {'wymiany':<8} | {'wymiany/s':<10} | {'p50 [ms]':<9} | {'p90 [ms]':<9} | {'p99 [ms]':<9}")
+        print("-" * 64)
+        for n_parties in args.parties:
+            stats = asyncio.run(run_simulation(n_parties, args.handshakes, p, g, executor))
+            print(f"{stats['parties']:<5} | {stats['handshakes']:<8} | {stats['handshakes_per_second']:<10.1f} | "
+                  f"{stats['p50'] * 1000:<9.2f} | {stats['p90'] * 1000:<9.2f} | {stats['p99'] * 1000:<9.2f}")
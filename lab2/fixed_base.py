@@ -0,0 +1,68 @@
+#potęgowanie o stałej podstawie z prekomputowaną tablicą (dla wielu wymian kluczy DH z tym samym g)
+
+import random
+import time
+
+class FixedBaseExp:
+    """Tablica T[i][j] = g^(j * 2^(w*i)) mod n dla cyfr wykładnika o szerokości w bitów.
+    g^x = iloczyn T[i][x_i] po cyfrach x_i wykładnika, więc potęgowanie nie wymaga podnoszenia
+    do kwadratu - tylko ceil(bity/w) mnożeń modulo n. Większe okno w to mniej mnożeń,
+    ale tablica ma ceil(bity/w) * 2^w elementów."""
+
+    def __init__(self, g: int, n: int, window: int = 6, max_exp_bits: int | None = None):
+        if window < 1:
+            raise ValueError("Szerokość okna musi być dodatnia")
+        self.g = g
+        self.n = n
+        self.window = window
+        self.max_exp_bits = max_exp_bits or n.bit_length()
+        self.digits = -(-self.max_exp_bits // window)
+        self.mask = (1 << window) - 1
+        self.table = []
+        base = g % n
+        for _ in range(self.digits):
+            row = [1] * (1 << window)
+            for j in range(1, 1 << window):
+                row[j] = row[j - 1] * base % n
+            self.table.append(row)
+            base = row[-1] * base % n #g^(2^(w*(i+1)))
+
+    def pow(self, x: int) -> int:
+        if x < 0 or x.bit_length() > self.max_exp_bits:
+            return pow(self.g, x, self.n) #wykładnik poza zakresem tablicy
+        n, mask, w = self.n, self.mask, self.window
+        result = 1
+        for row in self.table:
+            digit = x & mask
+            if digit:
+                result = result * row[digit] % n
+            x >>= w
+            if not x:
+                break
+        return result
+
+    def memory_bytes(self) -> int:
+        """Przybliżony rozmiar tablicy (same wartości, bez narzutu obiektów Pythona)."""
+        return self.digits * (1 << self.window) * ((self.n.bit_length() + 7) // 8)
+
+if __name__ == "__main__":
+    from DH import RFC3526_GROUP14, find_primitive_safe
+
+    n = RFC3526_GROUP14
+    g = find_primitive_safe(n)
+    exponents = [random.randrange(2, n - 1) for _ in range(200)]
+
+    start = time.perf_counter()
+    expected = [pow(g, x, n) for x in exponents]
+    pow_rate = len(exponents) / (time.perf_counter() - start)
+    print(f"pow(g, x, n): {pow_rate:.1f} kluczy publicznych/s")
+
+    for window in (2, 4, 6, 8):
+        start = time.perf_counter()
+        table = FixedBaseExp(g, n, window)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        assert [table.pow(x) for x in exponents] == expected
+        rate = len(exponents) / (time.perf_counter() - start)
+        print(f"okno {window}: budowa {build_time:.3f} s, pamięć ~{table.memory_bytes() / 2**20:.2f} MB, "
+              f"{rate:.1f} kluczy publicznych/s ({rate / pow_rate:.1f}x)")
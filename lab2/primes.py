@@ -0,0 +1,182 @@
+#wspólne generowanie liczb pierwszych dla DH i RSA
+
+import math
+import random
+from functools import lru_cache
+
+SMALL_RANGE = 1 << 22 #przedziały nie większe niż to są przesiewane w całości
+SMALL_PRIME_LIMIT = 2000 #granica małych liczb pierwszych do wstępnego odsiewu kandydatów
+DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41) #wystarczają dla n < 3.3 * 10^24
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+def simple_sieve(limit: int) -> list[int]:
+    """Liczby pierwsze < limit - sito Eratostenesa tylko po liczbach nieparzystych."""
+    if limit <= 2:
+        return []
+    sieve = bytearray([1]) * (limit // 2) #sieve[i] odpowiada liczbie 2i+1
+    sieve[0] = 0
+    for i in range(1, (math.isqrt(limit - 1) - 1) // 2 + 1):
+        if sieve[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            sieve[start::p] = bytes(len(range(start, len(sieve), p)))
+    return [2] + [2 * i + 1 for i in range(1, len(sieve)) if sieve[i]]
+
+SMALL_PRIMES = simple_sieve(SMALL_PRIME_LIMIT)
+SMALL_PRIMORIAL = math.prod(SMALL_PRIMES) #gcd z iloczynem odsiewa kandydatów z małymi dzielnikami
+
+def segmented_sieve(low: int, high: int) -> list[int]:
+    """Liczby pierwsze z przedziału [low, high] - sito segmentowe z liczbami pierwszymi do sqrt(high)."""
+    low = max(low, 2)
+    if high < low:
+        return []
+    segment = bytearray([1]) * (high - low + 1)
+    for p in simple_sieve(math.isqrt(high) + 1):
+        start = max(p * p, (low + p - 1) // p * p)
+        segment[start - low::p] = bytes(len(range(start - low, len(segment), p)))
+    return [low + i for i, flag in enumerate(segment) if flag]
+
+@lru_cache(maxsize=8)
+def _primes_in_range(low: int, high: int) -> tuple[int, ...]:
+    return tuple(segmented_sieve(low, high))
+
+def miller_rabin(n: int, bases) -> bool:
+    d, r = n - 1, 0
+    while d % 2 == 0: #rozkład n-1 = d * 2^r
+        d //= 2
+        r += 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def mr_rounds(bits: int) -> int:
+    """Liczba rund Millera-Rabina dla losowego kandydata (błąd < 2^-100, FIPS 186-4, tabela C.3)."""
+    if bits >= 1536:
+        return 3
+    if bits >= 1024:
+        return 4
+    if bits >= 512:
+        return 7
+    return 40
+
+def is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    if n < SMALL_PRIME_LIMIT:
+        return n in SMALL_PRIMES
+    if math.gcd(n, SMALL_PRIMORIAL) != 1: #wstępny odsiew małymi liczbami pierwszymi
+        return False
+    if n < DETERMINISTIC_LIMIT:
+        return miller_rabin(n, DETERMINISTIC_BASES) #wynik dokładny
+    bases = [random.randrange(2, n - 1) for _ in range(mr_rounds(n.bit_length()))]
+    return miller_rabin(n, bases)
+
+def random_prime_in_range(low: int, high: int) -> int:
+    """Losowa liczba pierwsza z przedziału [low, high]."""
+    if high - low <= SMALL_RANGE: #mały przedział - wybieramy z listy liczb z sita
+        primes = _primes_in_range(low, high)
+        if not primes:
+            raise ValueError("Brak liczb pierwszych w zadanym przedziale")
+        return random.choice(primes)
+    while True:
+        n = random.randint(low, high) | 1
+        if n <= high and is_prime(n):
+            return n
+
+def random_prime(bits: int) -> int:
+    """Losowa liczba pierwsza o dokładnie bits bitach."""
+    if bits < 2:
+        raise ValueError("Liczba pierwsza musi mieć co najmniej 2 bity")
+    return random_prime_in_range(1 << (bits - 1), (1 << bits) - 1)
+
+def generate_safe_prime(bits: int, window: int = 4096) -> int:
+    """Bezpieczna liczba pierwsza p = 2q + 1 (q pierwsze) o dokładnie bits bitach.
+    Sito odrzuca kandydatów q, dla których q lub 2q + 1 ma mały dzielnik, a pozostałych
+    sprawdza najpierw tanim testem Fermata, a dopiero potem pełnym testem pierwszości."""
+    if bits < 3:
+        raise ValueError("Bezpieczna liczba pierwsza musi mieć co najmniej 3 bity")
+    if bits <= 16:
+        return random.choice([p for p in _primes_in_range(1 << (bits - 1), (1 << bits) - 1) if is_prime(p // 2)])
+    sieve_primes = SMALL_PRIMES[1:] #bez 2 - kandydaci q są nieparzyści
+    while True:
+        q_base = random.getrandbits(bits - 1) | (1 << (bits - 2)) | 1 #q ma bits-1 bitów
+        limit = min(window, ((1 << (bits - 1)) - 1 - q_base) // 2 + 1)
+        composite = bytearray(limit)
+        for r in sieve_primes:
+            inv2 = (r + 1) // 2 #odwrotność 2 modulo r
+            for residue in (0, (r - 1) // 2): #q ≡ 0 lub 2q + 1 ≡ 0 (mod r)
+                k = (residue - q_base) * inv2 % r
+                composite[k::r] = b"\x01" * len(range(k, limit, r))
+        for k in range(limit):
+            if composite[k]:
+                continue
+            q = q_base + 2 * k
+            p = 2 * q + 1
+            if pow(2, q - 1, q) == 1 and pow(2, p - 1, p) == 1 and is_prime(q) and is_prime(p):
+                return p
+
+def factorize(n: int) -> dict[int, int]:
+    """Rozkład n na czynniki pierwsze {czynnik: wykładnik} - dzielenie przez małe liczby pierwsze i rho Pollarda."""
+    factors = {}
+    for p in SMALL_PRIMES:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        d = _pollard_rho(m)
+        stack.extend((d, m // d))
+    return factors
+
+def _pollard_rho(n: int) -> int:
+    """Nietrywialny dzielnik złożonej liczby n (wariant Brenta)."""
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+def jacobi(a: int, n: int) -> int:
+    """Symbol Jacobiego (a/n) dla nieparzystego n > 0 (prawo wzajemności, bez potęgowania)."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
@@ -0,0 +1,74 @@
+#wsadowe szyfrowanie i deszyfrowanie RSA w puli procesów
+
+import os
+import random
+import time
+from itertools import chain, islice
+from multiprocessing import Pool
+
+from RSA import RSAPrivateKey, generate_two_primes, private_pow
+
+DEFAULT_CHUNKSIZE = 64 #liczba bloków wysyłanych do procesu w jednym zadaniu
+IN_PROCESS_THRESHOLD = 256 #mniejsze partie liczone są w bieżącym procesie (bez kosztu startu puli)
+
+_worker_pow = None #funkcja potęgowania ustawiana w każdym procesie roboczym
+
+def _make_pow(mode: str, key):
+    if mode == "decrypt":
+        return private_pow(key)[0]
+    e, n = key
+    return lambda m: pow(m, e, n)
+
+def _init_worker(mode: str, key):
+    global _worker_pow
+    _worker_pow = _make_pow(mode, key)
+
+def _apply(block: int) -> int:
+    return _worker_pow(block)
+
+def _run(mode: str, key, blocks, workers, chunksize, in_process_threshold):
+    """Zwraca wyniki w kolejności bloków wejściowych."""
+    blocks = iter(blocks)
+    head = list(islice(blocks, in_process_threshold))
+    if workers == 0 or len(head) < in_process_threshold: #mała partia lub wymuszony tryb lokalny
+        yield from map(_make_pow(mode, key), chain(head, blocks)) #funkcja lokalna - bez wspólnego stanu między generatorami
+        return
+    with Pool(workers or os.cpu_count(), initializer=_init_worker, initargs=(mode, key)) as pool:
+        yield from pool.imap(_apply, chain(head, blocks), chunksize=chunksize)
+
+def iter_decrypt(ciphers, private_key: "tuple[int,int] | RSAPrivateKey", workers: int | None = None,
+                 chunksize: int = DEFAULT_CHUNKSIZE, in_process_threshold: int = IN_PROCESS_THRESHOLD):
+    """Leniwie odszyfrowuje bloki (liczby c < n); workers=0 wymusza pracę w bieżącym procesie."""
+    return _run("decrypt", private_key, ciphers, workers, chunksize, in_process_threshold)
+
+def iter_encrypt(messages, public_key: tuple[int,int], workers: int | None = None,
+                 chunksize: int = DEFAULT_CHUNKSIZE, in_process_threshold: int = IN_PROCESS_THRESHOLD):
+    return _run("encrypt", public_key, messages, workers, chunksize, in_process_threshold)
+
+def batch_decrypt(ciphers, private_key: "tuple[int,int] | RSAPrivateKey", **kwargs) -> list[int]:
+    return list(iter_decrypt(ciphers, private_key, **kwargs))
+
+def batch_encrypt(messages, public_key: tuple[int,int], **kwargs) -> list[int]:
+    return list(iter_encrypt(messages, public_key, **kwargs))
+
+def split_blocks(data: bytes, width: int) -> list[int]:
+    """Dzieli szyfrogram z trybu blokowego (RSA.encrypt_blocks) na liczby o stałej szerokości width bajtów."""
+    return [int.from_bytes(data[i:i + width], 'big') for i in range(0, len(data), width)]
+
+if __name__ == "__main__":
+    e = 65537
+    p, q = generate_two_primes(1024)
+    key = RSAPrivateKey.from_primes(p, q, e)
+    messages = [random.randrange(2, key.n) for _ in range(2000)]
+    ciphers = batch_encrypt(messages, (e, key.n))
+
+    #przeplatane małe partie w bieżącym procesie nie mogą sobie nadpisywać funkcji potęgowania
+    pairs = zip(iter_encrypt(messages[:10], (e, key.n)), iter_decrypt(ciphers[:10], key))
+    assert all((c, m) == (ciphers[i], messages[i]) for i, (c, m) in enumerate(pairs))
+
+    for workers in sorted({0, 1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        plain = batch_decrypt(ciphers, key, workers=workers)
+        elapsed = time.perf_counter() - start
+        assert plain == messages
+        print(f"Procesy: {workers:<3} ({'lokalnie' if workers == 0 else 'pula'}): {len(ciphers) / elapsed:.1f} bloków/s")
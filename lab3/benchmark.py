@@ -0,0 +1,199 @@
+import argparse
+import csv
+import datetime
+import json
+import math
+import os
+import platform
+import ssl
+import statistics
+import time
+
+# =====================================================================
+# Wspólne narzędzie do pomiarów czasu (lab3)
+# Każdy pomiar: rozgrzewka, dobór liczby wywołań na próbkę (jak timeit.autorange),
+# a potem próbki zbierane aż przedział ufności mediany będzie dostatecznie wąski
+# (lub do limitu próbek/czasu). Wyniki razem z opisem środowiska zapisywane są
+# do JSON/CSV, a dwa pliki JSON można porównać, żeby wykryć spadek wydajności.
+# =====================================================================
+
+Z_95 = 1.96
+
+def pin_cpu(cpu: int = None):
+    """
+    Przypina bieżący proces do jednego rdzenia (domyślnie pierwszego dozwolonego), jeśli system na to pozwala.
+    Zwraca zbiór rdzeni, do których proces jest przypięty, lub None.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return None
+    allowed = sorted(os.sched_getaffinity(0))
+    os.sched_setaffinity(0, {allowed[0] if cpu is None else cpu})
+    return os.sched_getaffinity(0)
+
+def _read_sys(path: str):
+    try:
+        with open(path, encoding='ascii') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def environment() -> dict:
+    """Opis środowiska pomiaru: interpreter, OpenSSL, procesor, przypięcie do rdzeni, zarządca częstotliwości."""
+    affinity = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "openssl": ssl.OPENSSL_VERSION,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "cpu_affinity": affinity,
+        "pinned": affinity is not None and len(affinity) < os.cpu_count(),
+        "cpu_governor": _read_sys("/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor"),
+    }
+
+def summarize(samples) -> dict:
+    """
+    Statystyki próbek: mediana, kwartyle i IQR, średnia, odchylenie standardowe
+    oraz 95% przedział ufności mediany (z statystyk pozycyjnych, bez założeń o rozkładzie).
+    """
+    ordered = sorted(samples)
+    n = len(ordered)
+    if n >= 2:
+        q1, _, q3 = statistics.quantiles(ordered, n=4, method='inclusive')
+    else:
+        q1 = q3 = ordered[0]
+    half_width = Z_95 * math.sqrt(n) / 2
+    low_rank = max(0, math.floor(n / 2 - half_width))
+    high_rank = min(n - 1, math.ceil(n / 2 + half_width) - 1)
+    return {
+        "n": n,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "median": statistics.median(ordered),
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "mean": statistics.fmean(ordered),
+        "stdev": statistics.stdev(ordered) if n >= 2 else 0.0,
+        "ci_low": ordered[low_rank],
+        "ci_high": ordered[high_rank],
+    }
+
+def measure(func, *args, warmup: int = 1, min_repeats: int = 5, max_repeats: int = 100, max_time: float = 2.0,
+            min_sample_time: float = 1e-3, rel_precision: float = 0.02) -> dict:
+    """
+    Mierzy czas jednego wywołania func(*args) w sekundach.
+    Po rozgrzewce (warmup wywołań) dobiera liczbę wywołań na próbkę tak, by próbka trwała co najmniej
+    min_sample_time, i zbiera próbki, aż szerokość przedziału ufności mediany spadnie poniżej
+    rel_precision * mediana (co najmniej min_repeats, najwyżej max_repeats próbek lub max_time sekund).
+    Zwraca statystyki z summarize() uzupełnione o listę próbek i liczbę wywołań na próbkę.
+    """
+    for _ in range(warmup):
+        func(*args)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_sample_time:
+            break
+        number *= 10 if elapsed < min_sample_time / 10 else 2
+    samples = [elapsed / number]
+    deadline = time.perf_counter() + max_time
+    while len(samples) < max_repeats:
+        if len(samples) >= min_repeats:
+            stats = summarize(samples)
+            if stats["ci_high"] - stats["ci_low"] <= rel_precision * stats["median"] or time.perf_counter() > deadline:
+                break
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        samples.append((time.perf_counter() - start) / number)
+    stats = summarize(samples)
+    stats["number"] = number
+    stats["samples"] = samples
+    return stats
+
+class BenchmarkResults:
+    """
+    Zbiór wyników pomiarów z opisem środowiska, zapisywany do JSON lub CSV.
+    pin=True przypina proces do pierwszego dozwolonego rdzenia, pin=<numer> - do wskazanego rdzenia
+    (przed odczytem opisu środowiska, więc przypięcie trafia do metadanych).
+    """
+
+    def __init__(self, pin=None):
+        pin_requested = pin is not None and pin is not False
+        pinned_to = pin_cpu(None if pin is True else pin) if pin_requested else None
+        self.environment = environment()
+        self.environment["pin_requested"] = pin_requested
+        self.environment["pinned_to"] = sorted(pinned_to) if pinned_to is not None else None
+        self.results = []
+
+    def add(self, name: str, stats: dict, nbytes: int = None, **params) -> dict:
+        """
+        Dodaje wynik measure() pod nazwą name z parametrami params (np. algorithm='md5', size=1024).
+        Dla nbytes (bajty przetwarzane w jednym wywołaniu) dopisuje przepustowość w MB/s z mediany.
+        """
+        entry = {"name": name, "params": params, **{k: v for k, v in stats.items() if k != "samples"}}
+        if nbytes is not None:
+            entry["mb_per_s"] = nbytes / 2**20 / stats["median"] if stats["median"] > 0 else 0.0
+        entry["samples"] = stats.get("samples", [])
+        self.results.append(entry)
+        return entry
+
+    def save_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"environment": self.environment, "results": self.results}, f, indent=2, sort_keys=True)
+
+    def save_csv(self, path):
+        """Jedna linia na pomiar (bez surowych próbek); parametry w osobnych kolumnach."""
+        param_keys = sorted({key for entry in self.results for key in entry["params"]})
+        stat_keys = ["n", "number", "median", "q1", "q3", "iqr", "ci_low", "ci_high", "mean", "stdev", "min", "max", "mb_per_s"]
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", *param_keys, *stat_keys])
+            for entry in self.results:
+                writer.writerow([entry["name"], *(entry["params"].get(key, "") for key in param_keys),
+                                 *(entry.get(key, "") for key in stat_keys)])
+
+def _result_key(entry: dict) -> str:
+    return entry["name"] + json.dumps(entry["params"], sort_keys=True)
+
+def compare_results(baseline_path, current_path, threshold: float = 0.05) -> list:
+    """
+    Porównuje dwa pliki JSON z wynikami. Zwraca listę pomiarów, których mediana wzrosła o więcej niż
+    threshold, a przedziały ufności mediany się nie pokrywają (spadek wydajności).
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {_result_key(entry): entry for entry in json.load(f)["results"]}
+    with open(current_path, encoding='utf-8') as f:
+        current = json.load(f)["results"]
+    regressions = []
+    for entry in current:
+        old = baseline.get(_result_key(entry))
+        if old is None:
+            continue
+        change = entry["median"] / old["median"] - 1
+        if change > threshold and entry["ci_low"] > old["ci_high"]:
+            regressions.append({"name": entry["name"], "params": entry["params"], "baseline": old["median"],
+                                "current": entry["median"], "change": change})
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Porównanie dwóch plików JSON z wynikami pomiarów.")
+    parser.add_argument("baseline", help="wyniki odniesienia (JSON)")
+    parser.add_argument("current", help="nowe wyniki (JSON)")
+    parser.add_argument("--threshold", type=float, default=0.05, help="dopuszczalny względny wzrost mediany")
+    args = parser.parse_args()
+
+    regressions = compare_results(args.baseline, args.current, args.threshold)
+    for item in regressions:
+        params = ", ".join(f"{key}={value}" for key, value in item["params"].items())
+        print(f"{item['name']} ({params}): {item['baseline'] * 1e3:.4f} ms -> {item['current'] * 1e3:.4f} ms "
+              f"(+{item['change']:.1%})")
+    print(f"Spadków wydajności: {len(regressions)}")
+    raise SystemExit(1 if regressions else 0)
@@ -0,0 +1,172 @@
+import argparse
+import hashlib
+import secrets
+import time
+
+import numpy as np
+
+# =====================================================================
+# Szukanie kolizji prefiksów skrótu (paradoks urodzin)
+# Kandydaci to stały losowy prefiks + 8-bajtowy licznik, więc zamiast danych
+# wystarczy pamiętać numer kandydata. Prefiksy skrótów (do 64 bitów) trafiają jako
+# liczby całkowite do tablicy z adresowaniem otwartym (dwie tablice NumPy: klucze
+# i numery kandydatów), wstawianej i przeszukiwanej całymi partiami naraz.
+# =====================================================================
+
+EMPTY = np.uint32(0xFFFFFFFF)
+GOLDEN = np.uint64(0x9E3779B97F4A7C15)  # mnożnik do rozpraszania kluczy po tablicy
+BASE_SIZE = 16
+DEFAULT_BATCH_SIZE = 1 << 16
+
+class PrefixTable:
+    """
+    Tablica z adresowaniem otwartym (próbkowanie liniowe): prefiks skrótu -> numer kandydata.
+    Pojemność jest potęgą dwójki; po przekroczeniu max_load tablica jest podwajana.
+    Jeden wpis zajmuje 12 bajtów (klucz uint64 + numer uint32).
+    """
+
+    def __init__(self, capacity: int = 1 << 16, max_load: float = 0.75):
+        self.max_load = max_load
+        self.size = 0
+        self._allocate(max(16, 1 << (capacity - 1).bit_length()))
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.shift = np.uint64(64 - (capacity.bit_length() - 1))
+        self.keys = np.zeros(capacity, dtype=np.uint64)
+        self.values = np.full(capacity, EMPTY, dtype=np.uint32)
+
+    def _slots(self, keys: np.ndarray) -> np.ndarray:
+        return ((keys * GOLDEN) >> self.shift).astype(np.int64)
+
+    def _grow(self):
+        used = self.values != EMPTY
+        keys, values = self.keys[used], self.values[used]
+        self._allocate(self.capacity * 2)
+        self.size = 0
+        self.insert(keys, values)
+
+    def insert(self, keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Wstawia partię kluczy. Zwraca krotkę (nowe numery, zapamiętane numery) dla kluczy,
+        które już były w tablicy (także powtórzonych w tej samej partii) - czyli kolizji.
+        """
+        while (self.size + len(keys)) > self.max_load * self.capacity:
+            self._grow()
+        mask = self.capacity - 1
+        slots = self._slots(keys)
+        pending = np.arange(len(keys))
+        found_new = [np.empty(0, dtype=np.uint32)]
+        found_old = [np.empty(0, dtype=np.uint32)]
+        while len(pending):
+            pending_slots = slots[pending]
+            stored = self.values[pending_slots]
+            empty = stored == EMPTY
+            # wolne miejsca: z kilku kluczy celujących w ten sam slot wygrywa pierwszy
+            free_slots, first = np.unique(pending_slots[empty], return_index=True)
+            winners = pending[empty][first]
+            self.keys[free_slots] = keys[winners]
+            self.values[free_slots] = values[winners]
+            self.size += len(winners)
+            # zajęte miejsca: ten sam klucz to kolizja, inny klucz - próbujemy kolejnego slotu
+            same = ~empty & (self.keys[pending_slots] == keys[pending])
+            found_new.append(values[pending[same]])
+            found_old.append(stored[same])
+            placed = np.zeros(len(pending), dtype=bool)
+            placed[np.flatnonzero(empty)[first]] = True
+            retry = ~placed & ~same
+            advance = retry & ~empty  # przegrani w wolnym slocie sprawdzają go ponownie
+            slots[pending[advance]] = (slots[pending[advance]] + 1) & mask
+            pending = pending[retry]
+        return np.concatenate(found_new), np.concatenate(found_old)
+
+def candidate_inputs(base: bytes, start: int, count: int) -> np.ndarray:
+    """Macierz kandydatów start..start+count-1: każdy wiersz to base + licznik (8 bajtów, big endian)."""
+    counters = np.arange(start, start + count, dtype='>u8').view(np.uint8).reshape(count, 8)
+    prefix = np.tile(np.frombuffer(base, dtype=np.uint8), (count, 1))
+    return np.hstack([prefix, counters])
+
+def candidate(base: bytes, index: int) -> bytes:
+    return base + int(index).to_bytes(8, 'big')
+
+def hash_prefixes(hash_func_name: str, rows: np.ndarray, bits: int = 64) -> np.ndarray:
+    """Haszuje wiersze macierzy i zwraca pierwsze bits bitów każdego skrótu jako uint64."""
+    hash_func = getattr(hashlib, hash_func_name)
+    data = rows.tobytes()
+    width = rows.shape[1]
+    heads = b''.join([hash_func(data[i:i + width]).digest()[:8] for i in range(0, len(data), width)])
+    prefixes = np.frombuffer(heads, dtype='>u8').astype(np.uint64)
+    return prefixes >> np.uint64(64 - bits)
+
+def find_prefix_collisions(hash_func_name='sha256', bits=40, max_collisions=1, batch_size=DEFAULT_BATCH_SIZE,
+                           max_attempts=None, base=None) -> dict:
+    """
+    Szuka par różnych danych, których skróty mają te same pierwsze bits bitów (1 <= bits <= 64).
+    Domyślny limit prób to 2^(bits/2 + 2), czyli czterokrotność oczekiwanej liczby prób z paradoksu urodzin.
+    Zwraca słownik z listą kolizji (dane #1, dane #2, prefiks), liczbą prób i czasem.
+    """
+    if not 1 <= bits <= 64:
+        raise ValueError("Długość prefiksu musi być z zakresu 1-64 bitów")
+    if max_attempts is None:
+        max_attempts = int(2 ** (bits / 2 + 2))
+    if max_attempts >= int(EMPTY):
+        raise ValueError("Zbyt duża liczba prób dla 32-bitowych numerów kandydatów")
+    base = base if base is not None else secrets.token_bytes(BASE_SIZE)
+    table = PrefixTable(min(max_attempts, int(2 ** (bits / 2 + 1))))
+    collisions = []
+    attempts = 0
+    start = time.perf_counter()
+    while len(collisions) < max_collisions and attempts < max_attempts:
+        count = min(batch_size, max_attempts - attempts)
+        prefixes = hash_prefixes(hash_func_name, candidate_inputs(base, attempts, count), bits)
+        indices = np.arange(attempts, attempts + count, dtype=np.uint32)
+        new, old = table.insert(prefixes, indices)
+        attempts += count
+        for new_index, old_index in sorted(zip(new.tolist(), old.tolist())):
+            if len(collisions) == max_collisions:
+                break
+            collisions.append((candidate(base, old_index), candidate(base, new_index),
+                               int(prefixes[new_index - indices[0]])))
+    return {
+        "hash": hash_func_name,
+        "bits": bits,
+        "collisions": collisions,
+        "attempts": attempts,
+        "expected_attempts": (np.pi / 2 * 2 ** bits) ** 0.5,
+        "seconds": time.perf_counter() - start,
+        "table_bytes": table.keys.nbytes + table.values.nbytes,
+    }
+
+def count_prefix_matches(hash_func_name: str, target: bytes, input_size: int, num_trials: int, bit_length,
+                         batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Liczy, ile z num_trials losowych wiadomości ma skrót zgodny z target na pierwszych n bitach (n <= 64).
+    Zwraca słownik {n: liczba zgodnych prefiksów}.
+    """
+    target_prefix = np.uint64(int.from_bytes(target[:8], 'big'))
+    matches = {n: 0 for n in bit_length}
+    done = 0
+    while done < num_trials:
+        count = min(batch_size, num_trials - done)
+        rows = np.frombuffer(secrets.token_bytes(count * input_size), dtype=np.uint8).reshape(count, input_size)
+        differences = hash_prefixes(hash_func_name, rows) ^ target_prefix
+        for n in bit_length:
+            matches[n] += int(np.count_nonzero((differences >> np.uint64(64 - n)) == 0))
+        done += count
+    return matches
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Szukanie kolizji prefiksów skrótu metodą urodzinową.")
+    parser.add_argument("--hash", default='sha256', help="funkcja skrótu z hashlib")
+    parser.add_argument("--bits", type=int, nargs="+", default=[12, 24, 32, 40], help="długości prefiksu w bitach")
+    parser.add_argument("--collisions", type=int, default=1, help="liczba kolizji do znalezienia dla każdej długości")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="liczba kandydatów w partii")
+    args = parser.parse_args()
+
+    for bits in args.bits:
+        result = find_prefix_collisions(args.hash, bits, args.collisions, args.batch_size)
+        print(f"\n{args.hash.upper()}, prefiks {bits} bitów: {len(result['collisions'])} kolizji po {result['attempts']} próbach "
+              f"(oczekiwane ~{result['expected_attempts']:.0f}), czas {result['seconds']:.2f} s, "
+              f"tablica {result['table_bytes'] / 2**20:.1f} MB")
+        for first, second, prefix in result['collisions']:
+            print(f"  {first.hex()} / {second.hex()} -> prefiks {prefix:0{(bits + 3) // 4}x}")
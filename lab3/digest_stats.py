@@ -0,0 +1,112 @@
+import argparse
+import time
+
+import numpy as np
+
+from sac import co_occurrence, correlation_matrix, hash_rows
+
+# =====================================================================
+# Statystyki masowe skrótów
+# Losowe wejścia haszowane są partiami do ciągłej macierzy uint8 (skrót = wiersz),
+# a z każdej partii w jednym przebiegu aktualizujemy: liczbę jedynek na każdym bicie,
+# histogram wartości bajtów na każdej pozycji skrótu oraz macierz wspólnych jedynek
+# par bitów (do korelacji). Pamięć zależy tylko od rozmiaru partii, nie od liczby skrótów.
+# =====================================================================
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+class DigestStatistics:
+    """Akumulator statystyk dla skrótów o rozmiarze digest_size bajtów."""
+
+    def __init__(self, digest_size: int):
+        self.digest_size = digest_size
+        self.count = 0
+        self.ones = np.zeros(digest_size * 8, dtype=np.int64)
+        self.byte_counts = np.zeros((digest_size, 256), dtype=np.int64)
+        self.co_ones = np.zeros((digest_size * 8, digest_size * 8), dtype=np.int64)
+
+    def update(self, digests: np.ndarray):
+        """Dodaje partię skrótów (macierz uint8: skróty x bajty, najwyżej 2^24 wierszy)."""
+        bits = np.unpackbits(digests, axis=1)
+        self.count += len(digests)
+        self.ones += bits.sum(axis=0, dtype=np.int64)
+        positions = np.arange(self.digest_size) * 256
+        self.byte_counts += np.bincount((digests + positions).ravel(),
+                                        minlength=self.digest_size * 256).reshape(self.digest_size, 256)
+        self.co_ones += co_occurrence(bits)
+
+    def bit_bias(self) -> np.ndarray:
+        """Odchylenie częstości jedynek od 0.5 dla każdego bitu skrótu."""
+        return self.ones / self.count - 0.5
+
+    def byte_chi_square(self) -> tuple[np.ndarray, float]:
+        """
+        Statystyka chi-kwadrat zgodności wartości bajtów z rozkładem jednostajnym:
+        dla każdej pozycji bajtu (255 stopni swobody) i dla wszystkich bajtów razem.
+        """
+        expected = self.count / 256
+        per_position = ((self.byte_counts - expected) ** 2 / expected).sum(axis=1)
+        totals = self.byte_counts.sum(axis=0)
+        expected_total = self.count * self.digest_size / 256
+        overall = float(((totals - expected_total) ** 2 / expected_total).sum())
+        return per_position, overall
+
+    def bit_correlation(self) -> np.ndarray:
+        """Macierz współczynników korelacji między bitami skrótu (idealnie 0 poza przekątną)."""
+        return correlation_matrix(self.ones, self.co_ones, self.count)
+
+    def summary(self) -> dict:
+        bias = self.bit_bias()
+        per_position, overall = self.byte_chi_square()
+        correlation = self.bit_correlation()
+        off_diagonal = np.abs(correlation[~np.eye(len(correlation), dtype=bool)])
+        return {
+            "digests": self.count,
+            "ones_percent": float(self.ones.sum() / (self.count * self.digest_size * 8) * 100),
+            "max_abs_bias": float(np.abs(bias).max()),
+            "bias_z_max": float(np.abs(bias).max() * 2 * np.sqrt(self.count)),  # |z| najbardziej odchylonego bitu
+            "byte_chi2": overall,
+            "byte_chi2_dof": 255,
+            "byte_chi2_position_max": float(per_position.max()),
+            "max_abs_correlation": float(off_diagonal.max()),
+            "mean_abs_correlation": float(off_diagonal.mean()),
+        }
+
+def random_inputs(count: int, input_size: int, rng) -> np.ndarray:
+    return np.frombuffer(rng.bytes(count * input_size), dtype=np.uint8).reshape(count, input_size)
+
+def digest_statistics(hash_func_name='sha256', n=1_000_000, input_size=32, chunk_size=DEFAULT_CHUNK_SIZE,
+                      seed=None) -> DigestStatistics:
+    """Haszuje n losowych wejść partiami po chunk_size i zwraca akumulator statystyk."""
+    rng = np.random.default_rng(seed)
+    stats = None
+    done = 0
+    while done < n:
+        count = min(chunk_size, n - done)
+        digests = hash_rows(hash_func_name, random_inputs(count, input_size, rng))
+        if stats is None:
+            stats = DigestStatistics(digests.shape[1])
+        stats.update(digests)
+        done += count
+    return stats
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Statystyki bitów i bajtów dla dużej liczby skrótów.")
+    parser.add_argument("--hash", nargs="+", default=['md5', 'sha256', 'sha3_512'], help="funkcje skrótu z hashlib")
+    parser.add_argument("-n", type=int, default=1_000_000, help="liczba skrótów dla każdej funkcji")
+    parser.add_argument("--input-size", type=int, default=32, help="rozmiar danych wejściowych w bajtach")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="liczba skrótów w partii")
+    parser.add_argument("--seed", type=int, default=None, help="ziarno dla powtarzalnych wyników")
+    args = parser.parse_args()
+
+    for algo in args.hash:
+        start = time.perf_counter()
+        summary = digest_statistics(algo, args.n, args.input_size, args.chunk_size, args.seed).summary()
+        elapsed = time.perf_counter() - start
+        print(f"\n{algo.upper()}: {summary['digests']} skrótów w {elapsed:.1f} s")
+        print(f"  jedynki: {summary['ones_percent']:.4f}%, max |bias| bitu: {summary['max_abs_bias']:.5f} "
+              f"(|z| = {summary['bias_z_max']:.2f})")
+        print(f"  chi-kwadrat bajtów: {summary['byte_chi2']:.1f} (df = {summary['byte_chi2_dof']}), "
+              f"max dla pozycji: {summary['byte_chi2_position_max']:.1f}")
+        print(f"  korelacja bitów: max |r| = {summary['max_abs_correlation']:.5f}, "
+              f"średnia |r| = {summary['mean_abs_correlation']:.5f}")
@@ -0,0 +1,98 @@
+import argparse
+import hashlib
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# =====================================================================
+# Równoległe haszowanie wielu plików
+# Każdy plik jest mapowany w pamięci i czytany tylko raz - każdy fragment trafia
+# do wszystkich funkcji skrótu naraz. hashlib zwalnia GIL dla dużych buforów,
+# więc pliki haszowane w puli wątków korzystają z wielu rdzeni.
+# =====================================================================
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+def iter_files(paths):
+    """Rozwija listę ścieżek: pliki zwraca bez zmian, katalogi przegląda rekurencyjnie (w stałej kolejności)."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            yield path
+
+def hash_file_all(path, algorithms, chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple[dict, int]:
+    """
+    Haszuje jeden plik wszystkimi algorytmami w jednym przebiegu.
+    Zwraca krotkę: ({algorytm: skrót hex}, rozmiar pliku w bajtach).
+    """
+    hashers = [hashlib.new(algo) for algo in algorithms]
+    size = os.path.getsize(path)
+    if size:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, size, chunk_size):
+                    chunk = view[offset:offset + chunk_size]
+                    for hasher in hashers:
+                        hasher.update(chunk)
+                    chunk.release()
+            finally:
+                view.release()
+    return {algo: hasher.hexdigest() for algo, hasher in zip(algorithms, hashers)}, size
+
+def hash_files(paths, algorithms, workers=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple[dict, dict]:
+    """
+    Haszuje wszystkie pliki z listy ścieżek (pliki lub katalogi) w puli wątków.
+    Zwraca krotkę: (manifest {ścieżka: {algorytm: skrót hex}}, statystyki).
+    """
+    files = list(iter_files(paths))
+    manifest = {}
+    total_bytes = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = executor.map(lambda path: hash_file_all(path, algorithms, chunk_size), files)
+        for path, (digests, size) in zip(files, results):
+            manifest[path] = digests
+            total_bytes += size
+    elapsed = time.perf_counter() - start
+    stats = {
+        "files": len(files),
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "gb_per_s": total_bytes / elapsed / 1e9 if elapsed > 0 else 0,
+    }
+    return manifest, stats
+
+def write_manifest(manifest, algorithms, output):
+    """Zapisuje manifest jako plik TSV: ścieżka i skróty kolejnych algorytmów."""
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write("\t".join(["path", *algorithms]) + "\n")
+        for path, digests in manifest.items():
+            f.write("\t".join([path, *(digests[algo] for algo in algorithms)]) + "\n")
+
+if __name__ == '__main__':
+    from lab3_sprawozdanie import HASH_FUNCTIONS
+
+    parser = argparse.ArgumentParser(description="Równoległe haszowanie plików wszystkimi funkcjami skrótu.")
+    parser.add_argument("paths", nargs="+", help="pliki lub katalogi do zahaszowania")
+    parser.add_argument("--algorithms", nargs="+", default=HASH_FUNCTIONS, help="funkcje skrótu z hashlib")
+    parser.add_argument("--workers", type=int, default=None, help="liczba wątków (domyślnie liczba rdzeni)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rozmiar fragmentu w bajtach")
+    parser.add_argument("--output", help="plik TSV z manifestem skrótów")
+    args = parser.parse_args()
+
+    manifest, stats = hash_files(args.paths, args.algorithms, args.workers, args.chunk_size)
+    if args.output:
+        write_manifest(manifest, args.algorithms, args.output)
+    else:
+        for path, digests in manifest.items():
+            print(path)
+            for algo, digest in digests.items():
+                print(f"  {algo.upper():<10}: {digest}")
+    print(f"\nPliki: {stats['files']}, dane: {stats['bytes'] / 2**20:.1f} MB, czas: {stats['seconds']:.3f} s, "
+          f"przepustowość łączna: {stats['gb_per_s']:.3f} GB/s")
@@ -0,0 +1,82 @@
+import hashlib
+import mmap
+import os
+import secrets
+import time
+
+# =====================================================================
+# Strumieniowy pomiar szybkości funkcji skrótu
+# Dane są podawane do hashlib.update() fragmentami o zadanym rozmiarze,
+# z jednego, wielokrotnie używanego bufora lub z pliku mapowanego w pamięci,
+# więc zużycie pamięci nie zależy od rozmiaru haszowanych danych.
+# =====================================================================
+
+CHUNK_SIZES = [4 * 1024, 64 * 1024, 1024 * 1024, 8 * 1024 * 1024]
+
+def make_buffer(chunk_size: int) -> memoryview:
+    """Tworzy bufor losowych bajtów o rozmiarze jednego fragmentu (generowany poza pomiarem czasu)."""
+    return memoryview(secrets.token_bytes(chunk_size))
+
+def hash_stream_buffer(algo: str, total_size: int, buffer: memoryview) -> tuple[float, bytes]:
+    """
+    Haszuje total_size bajtów, podając ten sam bufor wielokrotnie do update().
+    Zwraca krotkę: (czas w sekundach, skrót).
+    """
+    chunk_size = len(buffer)
+    full_chunks, rest = divmod(total_size, chunk_size)
+    start = time.perf_counter()
+    hash_obj = hashlib.new(algo)
+    update = hash_obj.update
+    for _ in range(full_chunks):
+        update(buffer)
+    if rest:
+        update(buffer[:rest])
+    digest = hash_obj.digest()
+    return time.perf_counter() - start, digest
+
+def write_random_file(path, size: int, chunk_size: int = 1024 * 1024):
+    """Zapisuje plik z losowymi danymi fragmentami (bez trzymania całości w pamięci)."""
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining:
+            part = min(chunk_size, remaining)
+            f.write(secrets.token_bytes(part))
+            remaining -= part
+
+def hash_file_mmap(algo: str, path, chunk_size: int) -> tuple[float, bytes]:
+    """
+    Haszuje plik mapowany w pamięci, fragmentami o rozmiarze chunk_size.
+    Zwraca krotkę: (czas w sekundach, skrót).
+    """
+    start = time.perf_counter()
+    hash_obj = hashlib.new(algo)
+    if os.path.getsize(path):
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, len(view), chunk_size):
+                    hash_obj.update(view[offset:offset + chunk_size])
+            finally:
+                view.release()
+    digest = hash_obj.digest()
+    return time.perf_counter() - start, digest
+
+def measure_chunked_speed(algorithms, total_size_mb: int = 50, chunk_sizes=CHUNK_SIZES, path=None) -> dict:
+    """
+    Mierzy przepustowość (MB/s) każdej funkcji skrótu dla każdego rozmiaru fragmentu.
+    Bez ścieżki dane pochodzą z bufora w pamięci, ze ścieżką - z pliku mapowanego w pamięci.
+    Zwraca słownik {algorytm: {rozmiar fragmentu: MB/s}}.
+    """
+    if path is not None:
+        total_size_mb = os.path.getsize(path) / (1024 * 1024)
+    total_size = int(total_size_mb * 1024 * 1024)
+    results = {algo: {} for algo in algorithms}
+    for chunk_size in chunk_sizes:
+        buffer = make_buffer(chunk_size) if path is None else None
+        for algo in algorithms:
+            if path is None:
+                elapsed, _ = hash_stream_buffer(algo, total_size, buffer)
+            else:
+                elapsed, _ = hash_file_mmap(algo, path, chunk_size)
+            results[algo][chunk_size] = total_size_mb / elapsed if elapsed > 0 else 0
+    return results
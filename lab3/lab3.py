@@ -1,9 +1,12 @@
 import hashlib
-import time
 import random
 import string
 import binascii
 
+from benchmark import BenchmarkResults, measure
+from passwords import DEFAULT_CHARSET, brute_force
+from sac import sac_flip_counts
+
 def calculate_hashes(text):
     """Generuje i wyświetla wartości skrótu dla podanego tekstu."""
     # Konwersja tekstu na bajty
@@ -38,22 +41,31 @@ def calculate_hashes(text):
 
 def generate_data(size):
     """Generuje losowy ciąg znaków o zadanej długości"""
-    return ''.join(random.choice(string.ascii_letters) for _ in range(size))
+    return ''.join(random.choices(string.ascii_letters, k=size))
 
-def test_hash_function(hash_func, data):
-    """Testuje szybkość działania funkcji skrótu i zwraca czas oraz długość skrótu"""
-    start_time = time.time()
-    hash_obj = hash_func(data.encode('utf-8'))
-    hash_value = hash_obj.hexdigest()
-    end_time = time.time()
-    
-    execution_time = (end_time - start_time) * 1000  # w milisekundach
+def test_hash_function(hash_func, data, results=None, name=None):
+    """
+    Testuje szybkość działania funkcji skrótu i zwraca czas (mediana z wielu pomiarów) oraz długość skrótu.
+    Jeśli podano results (benchmark.BenchmarkResults), dopisuje do nich pełne statystyki pomiaru.
+    """
+    data_bytes = data.encode('utf-8')  # kodowanie poza mierzonym czasem
+    stats = measure(lambda: hash_func(data_bytes).hexdigest(), max_time=0.5)
+    hash_value = hash_func(data_bytes).hexdigest()
+    if results is not None:
+        results.add("hash", stats, nbytes=len(data_bytes), algorithm=name or hash_func().name, size=len(data_bytes))
+    
+    execution_time = stats["median"] * 1000  # w milisekundach
     hash_length = len(hash_value) * 4  # długość w bitach (każdy znak hex to 4 bity)
     
     return execution_time, hash_length, hash_value
 
-def compare_hash_functions():
-    """Porównuje szybkość działania i długość wyjścia różnych funkcji skrótu"""
+def compare_hash_functions(results_path=None):
+    """
+    Porównuje szybkość działania i długość wyjścia różnych funkcji skrótu.
+    Jeśli podano results_path, zapisuje wyniki pomiarów do plików <results_path>.json i <results_path>.csv.
+    """
+    results = BenchmarkResults()
+    
     # Funkcje skrótu do testowania
     hash_functions = {
         "MD5": hashlib.md5,
@@ -82,44 +94,58 @@ def compare_hash_functions():
         
         for func_name, func in hash_functions.items():
             # Testujemy każdą funkcję
-            time_ms, hash_length, hash_value = test_hash_function(func, test_data)
+            time_ms, hash_length, hash_value = test_hash_function(func, test_data, results, func_name)
             
             # Wyświetlamy wyniki
             print(f"{func_name:<10} | {size:<15} | {time_ms:.6f}ms | {hash_length:<12} | {hash_value[:20]}...")
-
-def check_common_password(password, md5_hash):
-    """Sprawdza czy hasło jest powszechnie znane"""
-    # Utworzenie słownika popularnych krótkich haseł (do 4 znaków)
-    common_passwords = {
-        "": "d41d8cd98f00b204e9800998ecf8427e",
-        "a": "0cc175b9c0f1b6a831c399e269772661",
-        "ab": "187ef4436122d1cc2f40dc2b92f0eba0",
-        "abc": "900150983cd24fb0d6963f7d28e17f72",
-        "abcd": "e2fc714c4727ee9395f324cd2e7f331f",
-        "1": "c4ca4238a0b923820dcc509a6f75849b",
-        "12": "c20ad4d76fe97759aa27a0c99bff6710",
-        "123": "202cb962ac59075b964b07152d234b70",
-        "1234": "81dc9bdb52d04dc20036dbd8313ed055",
-        "pass": "1a1dc91c907325c69271ddf0c944bc72",
-        "pass1": "7c6a180b36896a0a8c02787eeafb0e4c",
-        "test": "098f6bcd4621d373cade4e832627b4f6",
-        "admin": "21232f297a57a5a743894a0e4a801fc3",
-        "root": "63a9f0ea7bb98050796b649e85481845",
-        "qwer": "962012d09b8170d912f0669f6d7d9d07",
-        "asdf": "912ec803b2ce49e4a541068d495ab570",
-        "zxcv": "9df62e693988eb4e1e1444ece0578579",
-        "aaa": "47bce5c74f589f4867dbd57e9ca9f808",
-        "111": "698d51a19d8a121ce581499d7b701668",
-        "0000": "4a7d1ed414474e4033ac29ccb8653d9b"
-    }
     
+    if results_path is not None:
+        results.save_json(f"{results_path}.json")
+        results.save_csv(f"{results_path}.csv")
+
+# Słownik popularnych krótkich haseł (do 4 znaków) i odwrotne mapowanie skrót -> hasło
+COMMON_PASSWORDS = {
+    "": "d41d8cd98f00b204e9800998ecf8427e",
+    "a": "0cc175b9c0f1b6a831c399e269772661",
+    "ab": "187ef4436122d1cc2f40dc2b92f0eba0",
+    "abc": "900150983cd24fb0d6963f7d28e17f72",
+    "abcd": "e2fc714c4727ee9395f324cd2e7f331f",
+    "1": "c4ca4238a0b923820dcc509a6f75849b",
+    "12": "c20ad4d76fe97759aa27a0c99bff6710",
+    "123": "202cb962ac59075b964b07152d234b70",
+    "1234": "81dc9bdb52d04dc20036dbd8313ed055",
+    "pass": "1a1dc91c907325c69271ddf0c944bc72",
+    "pass1": "7c6a180b36896a0a8c02787eeafb0e4c",
+    "test": "098f6bcd4621d373cade4e832627b4f6",
+    "admin": "21232f297a57a5a743894a0e4a801fc3",
+    "root": "63a9f0ea7bb98050796b649e85481845",
+    "qwer": "962012d09b8170d912f0669f6d7d9d07",
+    "asdf": "912ec803b2ce49e4a541068d495ab570",
+    "zxcv": "9df62e693988eb4e1e1444ece0578579",
+    "aaa": "47bce5c74f589f4867dbd57e9ca9f808",
+    "111": "698d51a19d8a121ce581499d7b701668",
+    "0000": "4a7d1ed414474e4033ac29ccb8653d9b"
+}
+COMMON_MD5 = {md5: password for password, md5 in COMMON_PASSWORDS.items()}
+
+def check_common_password(password, md5_hash, index=None):
+    """
+    Sprawdza czy hasło jest powszechnie znane.
+    index - opcjonalny indeks skrótów (passwords.HashIndex) zbudowany z większej listy haseł.
+    """
     # Sprawdzenie, czy hasło jest w słowniku lub jego skrót jest znany
-    if password in common_passwords:
+    if password in COMMON_PASSWORDS:
         return True, "Hasło znajduje się w słowniku popularnych haseł"
     
-    if md5_hash in common_passwords.values():
+    if md5_hash in COMMON_MD5:
         return True, "Skrót MD5 znajduje się w bazie znanych skrótów"
     
+    # Wyszukiwanie binarne w indeksie skrótów na dysku
+    if index is not None and index.algo != 'md5':
+        raise ValueError(f"Indeks skrótów musi być zbudowany dla MD5, a nie {index.algo}")
+    if index is not None and index.lookup(md5_hash) is not None:
+        return True, "Skrót MD5 znajduje się w indeksie haseł"
+    
     # Symulacja sprawdzenia w większej bazie (dla celów edukacyjnych)
     if len(password) <= 2:
         return True, "Bardzo krótkie hasło (1-2 znaki) jest łatwe do złamania metodą brute-force"
@@ -247,7 +273,7 @@ def test_sac_criteria():
     print("powinien zmienić się z prawdopodobieństwem 0,5.")
     
     # Wybieramy SHA-256 do testów
-    hash_func = hashlib.sha256
+    hash_func_name = 'sha256'
     
     # Liczba testów
     num_tests = 10
@@ -258,48 +284,19 @@ def test_sac_criteria():
     # Rozmiar wyjścia SHA-256 (w bitach)
     output_size = 256
     
-    # Tablica do zliczania zmian dla każdego bitu wyjściowego
-    bit_changes = [0] * output_size
+    print("\nTestuję wpływ zmiany pojedynczego bitu wejściowego na wyjście...")
     
-    # Liczba wszystkich zmian bitów
-    total_bit_flips = 0
+    # Losowe dane wejściowe - dla każdej próbki silnik SAC haszuje od razu wszystkie
+    # wersje z jednym zmienionym bitem i zwraca macierz zmian (bity wejścia x bity wyjścia)
+    inputs = [bytes(random.getrandbits(8) for _ in range(input_size)) for _ in range(num_tests)]
+    flip_counts = sac_flip_counts(hash_func_name, inputs=inputs)
     
     # Liczba wszystkich testowanych bitów
-    total_bits_tested = 0
+    total_bits_tested = num_tests * input_size * 8
     
-    print("\nTestuję wpływ zmiany pojedynczego bitu wejściowego na wyjście...")
-    
-    for test in range(num_tests):
-        # Generujemy losowe dane wejściowe
-        random_bytes = bytearray(random.getrandbits(8) for _ in range(input_size))
-        input_data = bytes(random_bytes)
-        
-        # Obliczamy oryginalny skrót
-        original_hash = hash_func(input_data).digest()
-        
-        # Konwertujemy skrót na reprezentację binarną (ciąg 0 i 1)
-        original_bits = ''.join(format(byte, '08b') for byte in original_hash)
-        
-        # Dla każdego bitu w danych wejściowych
-        for byte_idx in range(len(random_bytes)):
-            for bit_idx in range(8):
-                # Zmieniamy pojedynczy bit
-                modified_bytes = bytearray(input_data)
-                modified_bytes[byte_idx] ^= (1 << bit_idx)  # XOR z odpowiednią maską bitową
-                
-                # Obliczamy nowy skrót
-                modified_hash = hash_func(bytes(modified_bytes)).digest()
-                
-                # Konwertujemy nowy skrót na bity
-                modified_bits = ''.join(format(byte, '08b') for byte in modified_hash)
-                
-                # Liczymy różnice bitów
-                for i in range(output_size):
-                    if original_bits[i] != modified_bits[i]:
-                        bit_changes[i] += 1
-                        total_bit_flips += 1
-                
-                total_bits_tested += 1
+    # Tablica zmian dla każdego bitu wyjściowego i liczba wszystkich zmian bitów
+    bit_changes = flip_counts.sum(axis=0).tolist()
+    total_bit_flips = sum(bit_changes)
     
     # Obliczamy prawdopodobieństwo zmiany dla każdego bitu
     change_probabilities = [changes / total_bits_tested for changes in bit_changes]
@@ -348,8 +345,8 @@ def main():
     print("\nWyniki dla wprowadzonego tekstu:")
     md5_hash = calculate_hashes(text)
     
-    # 2. Następnie automatycznie porównujemy funkcje skrótu
-    compare_hash_functions()
+    # 2. Następnie automatycznie porównujemy funkcje skrótu (wyniki także w hash_compare.json/.csv)
+    compare_hash_functions("hash_compare")
     
     # 3. Sprawdzamy bezpieczeństwo krótkiego hasła
     print("\nTest bezpieczeństwa hasła:")
@@ -370,6 +367,15 @@ def main():
     else:
         print(message)
     
+    # Łamanie skrótu hasła metodą brute-force (małe litery i cyfry, do 4 znaków)
+    result = brute_force([short_pw_md5], DEFAULT_CHARSET, max_length=4)
+    cracked = result["found"].get(short_pw_md5)
+    if cracked is not None:
+        print(f"Brute-force: hasło '{cracked}' odzyskane w {result['seconds']:.2f} s")
+    else:
+        print(f"Brute-force: hasła nie znaleziono w przestrzeni {DEFAULT_CHARSET} (do 4 znaków)")
+    print(f"Sprawdzono {result['hashes']} skrótów ({result['hashes_per_second'] / 1e6:.2f} mln skrótów/s)")
+    
     # Omówienie bezpieczeństwa krótkich haseł
     discuss_password_security()
     
@@ -1,11 +1,16 @@
 import hashlib
-import time
 import random
 import string
 import binascii
 import secrets
 import matplotlib.pyplot as plt
 import numpy as np
+from hash_stream import CHUNK_SIZES, measure_chunked_speed
+from benchmark import BenchmarkResults, measure
+from collisions import count_prefix_matches
+from digest_stats import digest_statistics
+from merkle import merkle_hash
+from sac import bic_matrix, hash_rows, parallel_sac_bic, sample_flip_counts, save_results
 
 HASH_FUNCTIONS = [
     'md5',  
@@ -13,6 +18,14 @@ HASH_FUNCTIONS = [
     'sha3_512'
 ]
 
+# Haszowanie drzewem Merkle'a (liście haszowane równolegle) - porównywane z funkcjami sekwencyjnymi
+MERKLE_FUNCTIONS = [
+    'merkle_sha256',
+    'merkle_blake2b'
+]
+
+BENCHMARK_FUNCTIONS = HASH_FUNCTIONS + MERKLE_FUNCTIONS
+
 SIZES_MB = [10, 25, 50]
 
 def generate_data(size):
@@ -21,14 +34,17 @@ def generate_data(size):
 def generate_data_str(size):
     return ''.join(random.choice(string.ascii_letters + string.digits) for _ in range(size))
 
+def digest_data(algo: str, data: bytes) -> bytes:
+    """Skrót danych funkcją z hashlib lub korzeń drzewa Merkle'a (nazwy 'merkle_<funkcja liścia>')."""
+    if algo.startswith('merkle_'):
+        return merkle_hash(data, algo=algo[len('merkle_'):])
+    return getattr(hashlib, algo)(data).digest()
+
 def measure_hash_speed(data: bytes):
+    """Mediana czasu haszowania danych (rozgrzewka i liczba powtórzeń dobierane przez benchmark.measure)."""
     results = {}
-    for algo in HASH_FUNCTIONS:
-        hash_func = getattr(hashlib, algo)
-        start = time.perf_counter()
-        hash_func(data).digest()
-        end = time.perf_counter()
-        results[algo] = end - start
+    for algo in BENCHMARK_FUNCTIONS:
+        results[algo] = measure(digest_data, algo, data)["median"]
     return results
 
 def benchmark_hashing():
@@ -40,15 +56,6 @@ def benchmark_hashing():
             print(f"{algo.upper():<10}: {duration:.6f} s")
     print('\n')
 
-def flip_bit(data: bytes, bit_index: int) -> bytes:
-    byte_index = bit_index // 8
-    bit_in_byte = bit_index % 8
-    flipped_byte = data[byte_index] ^ (1 << bit_in_byte)  # zmiana bitu za pomocą XOR
-    return data[:byte_index] + bytes([flipped_byte]) + data[byte_index + 1:]
-
-def count_bit_differences(a: bytes, b: bytes) -> int:
-    return sum(bin(x ^ y).count('1') for x, y in zip(a, b))
-
 # =====================================================================
 # Wydzielenie rdzenia obliczeniowego SAC do jednej funkcji compute_sac()
 # =====================================================================
@@ -57,19 +64,12 @@ def compute_sac(hash_func_name='sha256', input_size=32):
     Oblicza średnią liczbę zmienionych bitów wyjścia (SAC) dla pojedynczego testu.
     Zwraca krotkę: (średnia liczba zmienionych bitów, długość hashu w bitach).
     """
-    hash_func = getattr(hashlib, hash_func_name)
     input_bits = input_size * 8
     original_data = secrets.token_bytes(input_size)
-    original_hash = hash_func(original_data).digest()
-    total_changed_bits = 0
+    flips = sample_flip_counts(hash_func_name, original_data)  # macierz bity wejścia x bity wyjścia
 
-    for i in range(input_bits):
-        modified_data = flip_bit(original_data, i)
-        modified_hash = hash_func(modified_data).digest()
-        total_changed_bits += count_bit_differences(original_hash, modified_hash)
-    
-    avg_change = total_changed_bits / input_bits
-    hash_len_bits = len(original_hash) * 8
+    avg_change = int(flips.sum()) / input_bits
+    hash_len_bits = flips.shape[1]
     return avg_change, hash_len_bits
 
 def test_sac(hash_func_name='sha256', input_size=32):
@@ -133,15 +133,20 @@ def hash_prefix_equal(h1: bytes, h2: bytes, n_bits: int) -> bool:
 # ================================
 # Funkcje zbierające statystyki
 # ================================
-def collect_hash_speed_stats(repetitions=10):
+def collect_hash_speed_stats(repetitions=10, results=None):
+    """
+    Zwraca {rozmiar: {algorytm: lista czasów}} - repetitions próbek po rozgrzewce.
+    Jeśli podano results (BenchmarkResults), dopisuje do nich statystyki każdego pomiaru.
+    """
     stats = {}
     for size in SIZES_MB:
-        stats[size] = {algo: [] for algo in HASH_FUNCTIONS}
-        for rep in range(repetitions):
-            data = generate_data(size)
-            results = measure_hash_speed(data)
-            for algo, duration in results.items():
-                stats[size][algo].append(duration)
+        stats[size] = {}
+        data = generate_data(size)
+        for algo in BENCHMARK_FUNCTIONS:
+            measured = measure(digest_data, algo, data, min_repeats=repetitions, max_repeats=repetitions)
+            stats[size][algo] = measured["samples"]
+            if results is not None:
+                results.add("hash_speed", measured, nbytes=len(data), algorithm=algo, size_mb=size)
     return stats
 
 def plot_hash_speed_stats(stats, save_plots=False):
@@ -196,19 +201,40 @@ def plot_sac_stats(averages, hash_func_name='sha256', save_plots=False):
         plt.savefig(f"sac_errorbar_{hash_func_name}.png")
     plt.show()
 
+def plot_sac_bic_heatmaps(result, save_plots=False):
+    """
+    Mapy cieplne macierzy SAC (bit wejścia x bit wyjścia) i BIC (korelacje par bitów wyjścia).
+    Wynik pochodzi z parallel_sac_bic() lub z pliku .npz wczytanego przez sac.load_results().
+    """
+    hash_func_name = result["hash"]
+    sac_probabilities = result["flip_counts"] / result["samples"]
+    bic = bic_matrix(result)
+    np.fill_diagonal(bic, 0)
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    image = axes[0].imshow(sac_probabilities, aspect='auto', cmap='coolwarm', vmin=0, vmax=1)
+    axes[0].set_title(f"SAC {hash_func_name.upper()}: P(zmiana bitu wyjścia)")
+    axes[0].set_xlabel("Bit wyjścia")
+    axes[0].set_ylabel("Bit wejścia")
+    fig.colorbar(image, ax=axes[0])
+    limit = np.nanmax(np.abs(bic))
+    image = axes[1].imshow(bic, cmap='coolwarm', vmin=-limit, vmax=limit)
+    axes[1].set_title(f"BIC {hash_func_name.upper()}: korelacja zmian par bitów wyjścia")
+    axes[1].set_xlabel("Bit wyjścia")
+    axes[1].set_ylabel("Bit wyjścia")
+    fig.colorbar(image, ax=axes[1])
+    plt.tight_layout()
+    if save_plots:
+        plt.savefig(f"sac_bic_heatmap_{hash_func_name}.png")
+    plt.show()
+
 def collect_prefix_collision_stats(hash_func_name='sha256', input_size=128, num_trials=100000, bit_length=[8, 16, 24], repetitions=5):
     stats = {n: [] for n in bit_length}
     for rep in range(repetitions):
         hash_func = getattr(hashlib, hash_func_name)
         m = secrets.token_bytes(input_size)
         h_m = hash_func(m).digest()
-        collisions = {n: 0 for n in bit_length}
-        for i in range(num_trials):
-            m_prime = secrets.token_bytes(input_size)
-            h_m_prime = hash_func(m_prime).digest()
-            for n in bit_length:
-                if hash_prefix_equal(h_m, h_m_prime, n):
-                    collisions[n] += 1
+        collisions = count_prefix_matches(hash_func_name, h_m, input_size, num_trials, bit_length)  # partiami, prefiksy jako liczby
         for n in bit_length:
             stats[n].append(collisions[n])
     return stats
@@ -238,17 +264,14 @@ def plot_prefix_collision_stats(stats, num_trials, bit_length=[8, 16, 24], save_
 # =====================================
 # Dodatkowe statystyki (inne przykłady)
 # =====================================
-def collect_hash_throughput_stats(algorithm_list=HASH_FUNCTIONS, data_size=50, repetitions=10):
-    throughput = {algo: [] for algo in algorithm_list}
-    for rep in range(repetitions):
-        data = generate_data(data_size)
-        for algo in algorithm_list:
-            hash_func = getattr(hashlib, algo)
-            start = time.perf_counter()
-            hash_func(data).digest()
-            end = time.perf_counter()
-            elapsed = end - start
-            throughput[algo].append(data_size / elapsed if elapsed > 0 else 0)
+def collect_hash_throughput_stats(algorithm_list=BENCHMARK_FUNCTIONS, data_size=50, repetitions=10, results=None):
+    throughput = {}
+    data = generate_data(data_size)
+    for algo in algorithm_list:
+        measured = measure(digest_data, algo, data, min_repeats=repetitions, max_repeats=repetitions)
+        throughput[algo] = [data_size / elapsed if elapsed > 0 else 0 for elapsed in measured["samples"]]
+        if results is not None:
+            results.add("hash_throughput", measured, nbytes=len(data), algorithm=algo, size_mb=data_size)
     return throughput
 
 def plot_hash_throughput_stats(throughput_stats, save_plots=False):
@@ -267,19 +290,38 @@ def plot_hash_throughput_stats(throughput_stats, save_plots=False):
         plt.savefig("hash_throughput.png")
     plt.show()
 
+def plot_chunked_throughput(results, save_plots=False):
+    """
+    Wykres przepustowości haszowania strumieniowego w zależności od rozmiaru fragmentu.
+    Jeśli save_plots=True, zapisuje wykres jako plik PNG.
+    """
+    plt.figure(figsize=(10, 6))
+    for algo, by_chunk in results.items():
+        chunk_sizes = list(by_chunk.keys())
+        plt.plot([size / 1024 for size in chunk_sizes], list(by_chunk.values()), marker='o', label=algo.upper())
+    plt.xscale('log')
+    plt.title("Przepustowość haszowania strumieniowego a rozmiar fragmentu")
+    plt.xlabel("Rozmiar fragmentu (KB)")
+    plt.ylabel("Przepustowość (MB/s)")
+    plt.legend()
+    plt.tight_layout()
+    if save_plots:
+        plt.savefig("hash_chunk_throughput.png")
+    plt.show()
+
 def collect_bit_distribution_stats(input_size=32, repetitions=10):
-    stats = {algo: [] for algo in HASH_FUNCTIONS}
-    for rep in range(repetitions):
-        data = secrets.token_bytes(input_size)
-        for algo in HASH_FUNCTIONS:
-            hash_func = getattr(hashlib, algo)
-            digest = hash_func(data).digest()
-            total_bits = len(digest) * 8
-            ones = sum(bin(b).count('1') for b in digest)
-            percentage = (ones / total_bits) * 100
-            stats[algo].append(percentage)
+    inputs = np.frombuffer(secrets.token_bytes(repetitions * input_size), dtype=np.uint8).reshape(repetitions, input_size)
+    stats = {}
+    for algo in HASH_FUNCTIONS:
+        digests = hash_rows(algo, inputs)  # macierz uint8: powtórzenia x bajty skrótu
+        ones = np.unpackbits(digests, axis=1).sum(axis=1)
+        stats[algo] = (ones / (digests.shape[1] * 8) * 100).tolist()
     return stats
 
+def collect_digest_statistics(n=1_000_000, input_size=32):
+    """Statystyki masowe (bias bitów, chi-kwadrat bajtów, korelacje bitów) dla n skrótów każdej funkcji."""
+    return {algo: digest_statistics(algo, n, input_size).summary() for algo in HASH_FUNCTIONS}
+
 def plot_bit_distribution_stats(stats, save_plots=False):
     algorithms = list(stats.keys())
     means = [np.mean(stats[algo]) for algo in algorithms]
@@ -309,7 +351,8 @@ def main():
     
     # Statystyki prędkości haszowania
     print("\n=== Statystyki prędkości haszowania ===")
-    hash_speed_stats = collect_hash_speed_stats(repetitions=10)
+    benchmark_results = BenchmarkResults()
+    hash_speed_stats = collect_hash_speed_stats(repetitions=10, results=benchmark_results)
     for size, algos in hash_speed_stats.items():
         print(f"\nRozmiar danych: {size} MB")
         for algo, times in algos.items():
@@ -321,6 +364,12 @@ def main():
     sac_stats = collect_sac_stats('sha256', input_size=32, repetitions=10)
     print("Surowe dane SAC:", sac_stats)
     plot_sac_stats(sac_stats, 'sha256', save_plots=True)
+
+    # Macierze SAC i BIC liczone równolegle (zapisywane do .npz do późniejszej analizy)
+    print("\n=== Macierze SAC i BIC ===")
+    sac_bic = parallel_sac_bic('sha256', input_size=32, samples=1000)
+    save_results("sac_bic_sha256.npz", sac_bic)
+    plot_sac_bic_heatmaps(sac_bic, save_plots=True)
     
     # Statystyki kolizji prefiksu
     print("\n=== Statystyki kolizji prefiksu ===")
@@ -332,10 +381,21 @@ def main():
     
     # Dodatkowe statystyki: Przepustowość funkcji skrótu
     print("\n=== Statystyki przepustowości funkcji skrótu (MB/s) ===")
-    throughput_stats = collect_hash_throughput_stats(data_size=50, repetitions=10)
+    throughput_stats = collect_hash_throughput_stats(data_size=50, repetitions=10, results=benchmark_results)
     for algo, values in throughput_stats.items():
         print(f"  {algo.upper():<10}: {values}")
     plot_hash_throughput_stats(throughput_stats, save_plots=True)
+
+    # Wyniki pomiarów do porównania między uruchomieniami (python benchmark.py stare.json nowe.json)
+    benchmark_results.save_json("hash_benchmark.json")
+    benchmark_results.save_csv("hash_benchmark.csv")
+
+    # Przepustowość haszowania strumieniowego (stały bufor, fragmenty różnej wielkości)
+    print("\n=== Przepustowość haszowania strumieniowego (MB/s) ===")
+    chunked_stats = measure_chunked_speed(HASH_FUNCTIONS, total_size_mb=50, chunk_sizes=CHUNK_SIZES)
+    for algo, by_chunk in chunked_stats.items():
+        print(f"  {algo.upper():<10}: " + ", ".join(f"{size // 1024} KB: {speed:.1f}" for size, speed in by_chunk.items()))
+    plot_chunked_throughput(chunked_stats, save_plots=True)
     
     # Dodatkowe statystyki: Rozkład bitów w haśhu
     print("\n=== Statystyki rozkładu jedynek w haśhu (%) ===")
@@ -344,5 +404,11 @@ def main():
         print(f"  {algo.upper():<10}: {values}")
     plot_bit_distribution_stats(bit_dist_stats, save_plots=True)
 
+    # Statystyki masowe dla miliona skrótów (liczone partiami, stała pamięć)
+    print("\n=== Statystyki masowe skrótów (10^6 skrótów) ===")
+    for algo, summary in collect_digest_statistics(n=1_000_000, input_size=32).items():
+        print(f"  {algo.upper():<10}: jedynki {summary['ones_percent']:.4f}%, max |bias| {summary['max_abs_bias']:.5f}, "
+              f"chi2 bajtów {summary['byte_chi2']:.1f} (df 255), max |r| bitów {summary['max_abs_correlation']:.5f}")
+
 if __name__ == '__main__':
     main()
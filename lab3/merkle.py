@@ -0,0 +1,88 @@
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# =====================================================================
+# Drzewo Merkle'a dla dużych danych
+# Dane dzielone są na liście o stałym rozmiarze, liście haszowane są równolegle
+# (hashlib zwalnia GIL, więc wątki pracują na wielu rdzeniach), a węzły wewnętrzne
+# łączą po dwa skróty. Zmiana jednego liścia wymaga przeliczenia tylko ścieżki do korzenia.
+# Skróty liści i węzłów są rozróżnione prefiksem (0x00 - liść, 0x01 - węzeł), jak w RFC 6962.
+# =====================================================================
+
+DEFAULT_LEAF_SIZE = 1024 * 1024
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+def hash_leaf(algo: str, data) -> bytes:
+    hash_obj = hashlib.new(algo)
+    hash_obj.update(LEAF_PREFIX)
+    hash_obj.update(data)
+    return hash_obj.digest()
+
+def hash_node(algo: str, left: bytes, right: bytes) -> bytes:
+    return hashlib.new(algo, NODE_PREFIX + left + right).digest()
+
+class MerkleTree:
+    """
+    Drzewo Merkle'a przechowujące wszystkie poziomy skrótów.
+    levels[0] to skróty liści, levels[-1] to jednoelementowa lista z korzeniem.
+    Węzeł bez pary na danym poziomie przechodzi na wyższy poziom bez zmian.
+    """
+
+    def __init__(self, leaf_hashes, algo: str = 'blake2b', leaf_size: int = DEFAULT_LEAF_SIZE):
+        self.algo = algo
+        self.leaf_size = leaf_size
+        self.levels = [list(leaf_hashes) or [hash_leaf(algo, b"")]]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [hash_node(algo, level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @classmethod
+    def from_buffer(cls, data, algo: str = 'blake2b', leaf_size: int = DEFAULT_LEAF_SIZE, workers=None) -> "MerkleTree":
+        """Buduje drzewo z bufora (bytes, memoryview, mmap), haszując liście w puli wątków."""
+        view = memoryview(data)
+        try:
+            offsets = range(0, len(view), leaf_size)
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+                leaf_hashes = list(executor.map(lambda offset: hash_leaf(algo, view[offset:offset + leaf_size]), offsets))
+        finally:
+            view.release()
+        return cls(leaf_hashes, algo, leaf_size)
+
+    @classmethod
+    def from_file(cls, path, algo: str = 'blake2b', leaf_size: int = DEFAULT_LEAF_SIZE, workers=None) -> "MerkleTree":
+        """Buduje drzewo dla pliku mapowanego w pamięci (plik nie jest wczytywany w całości)."""
+        if not os.path.getsize(path):
+            return cls([], algo, leaf_size)
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return cls.from_buffer(mapped, algo, leaf_size, workers)
+
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def hexdigest(self) -> str:
+        return self.root().hex()
+
+    def update_leaf(self, index: int, data) -> bytes:
+        """Podmienia dane jednego liścia i przelicza tylko węzły na ścieżce do korzenia. Zwraca nowy korzeń."""
+        self.levels[0][index] = hash_leaf(self.algo, data)
+        for depth in range(len(self.levels) - 1):
+            level = self.levels[depth]
+            sibling = index ^ 1
+            if sibling < len(level):
+                left, right = (level[index], level[sibling]) if index % 2 == 0 else (level[sibling], level[index])
+                parent = hash_node(self.algo, left, right)
+            else:
+                parent = level[index]  # węzeł bez pary przechodzi wyżej bez zmian
+            index //= 2
+            self.levels[depth + 1][index] = parent
+        return self.root()
+
+def merkle_hash(data, algo: str = 'blake2b', leaf_size: int = DEFAULT_LEAF_SIZE, workers=None) -> bytes:
+    """Zwraca korzeń drzewa Merkle'a dla danych w pamięci."""
+    return MerkleTree.from_buffer(data, algo, leaf_size, workers).root()
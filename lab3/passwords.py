@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import itertools
+import mmap
+import os
+import string
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# =====================================================================
+# Indeks skrótów haseł na dysku i łamanie krótkich haseł metodą brute-force
+# Indeks to plik z posortowanymi skrótami binarnymi słów ze słownika: plik jest
+# mapowany w pamięci, a skróty wyszukiwane binarnie (np.searchsorted), także całymi
+# partiami. Brute-force dzieli przestrzeń haseł na fragmenty o wspólnym prefiksie
+# i przydziela je procesom z puli.
+# =====================================================================
+
+INDEX_MAGIC = b"HASHIDX1"
+INDEX_HEADER = struct.Struct("<8s16sIQ")  # magia, algorytm, rozmiar skrótu, liczba rekordów
+DEFAULT_CHARSET = string.ascii_lowercase + string.digits
+
+def _record_dtype(digest_size: int) -> np.dtype:
+    return np.dtype([("digest", f"S{digest_size}"), ("offset", "<u8")])
+
+def build_index(wordlist_path, index_path, algo: str = 'md5') -> int:
+    """
+    Buduje indeks z listy słów (jedno hasło w linii, UTF-8).
+    Układ pliku: nagłówek, rekordy (skrót, przesunięcie słowa) posortowane po skrócie, słowa zakończone '\\n'.
+    Zwraca liczbę zapisanych haseł.
+    """
+    hash_func = getattr(hashlib, algo)
+    with open(wordlist_path, 'rb') as f:
+        words = [line.rstrip(b"\r\n") for line in f]
+    digest_size = hash_func().digest_size
+    records = np.empty(len(words), dtype=_record_dtype(digest_size))
+    records["digest"] = [hash_func(word).digest() for word in words]
+    lengths = np.fromiter((len(word) + 1 for word in words), dtype=np.uint64, count=len(words))
+    records["offset"] = np.cumsum(lengths) - lengths
+    records.sort(order="digest", kind="stable")
+    with open(index_path, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, algo.encode('ascii'), digest_size, len(words)))
+        f.write(records.tobytes())
+        for word in words:
+            f.write(word + b"\n")
+    return len(words)
+
+class HashIndex:
+    """Indeks skrótów otwarty z pliku mapowanego w pamięci (nie jest wczytywany w całości)."""
+
+    def __init__(self, index_path):
+        self._file = open(index_path, 'rb')
+        self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, algo, digest_size, count = INDEX_HEADER.unpack_from(self._mapped)
+        if magic != INDEX_MAGIC:
+            raise ValueError("Plik nie jest indeksem skrótów")
+        self.algo = algo.rstrip(b"\0").decode('ascii')
+        self.digest_size = digest_size
+        dtype = _record_dtype(digest_size)
+        self.records = np.frombuffer(self._mapped, dtype=dtype, count=count, offset=INDEX_HEADER.size)
+        self.words_offset = INDEX_HEADER.size + count * dtype.itemsize
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.records = None
+        self._mapped.close()
+        self._file.close()
+
+    def _word(self, offset: int) -> str:
+        start = self.words_offset + offset
+        return self._mapped[start:self._mapped.find(b"\n", start)].decode('utf-8', errors='replace')
+
+    def lookup_many(self, digests) -> list:
+        """Wyszukuje partię skrótów (bytes lub hex); zwraca listę haseł (None dla nieznalezionych)."""
+        keys = [bytes.fromhex(d) if isinstance(d, str) else d for d in digests]
+        # numpy obcięłby lub dopełnił klucz do rozmiaru rekordu - skrót innej funkcji dałby fałszywy wynik
+        if any(len(key) != self.digest_size for key in keys):
+            raise ValueError(f"Indeks zawiera skróty {self.algo} o długości {self.digest_size} bajtów")
+        keys = np.array(keys, dtype=self.records.dtype["digest"])
+        if not len(self.records):
+            return [None] * len(keys)
+        positions = np.searchsorted(self.records["digest"], keys)
+        positions = np.minimum(positions, len(self.records) - 1)
+        hits = self.records["digest"][positions] == keys
+        return [self._word(int(self.records["offset"][pos])) if hit else None for pos, hit in zip(positions, hits)]
+
+    def lookup(self, digest):
+        return self.lookup_many([digest])[0]
+
+def _brute_force_unit(algo: str, charset: str, prefix: str, length: int, targets: frozenset) -> tuple[dict, int]:
+    """Sprawdza wszystkie hasła o danej długości zaczynające się od prefix. Zwraca (znalezione, liczba skrótów)."""
+    hash_func = getattr(hashlib, algo)
+    prefix_bytes = prefix.encode('utf-8')
+    found = {}
+    count = 0
+    for suffix in itertools.product(charset.encode('utf-8'), repeat=length - len(prefix)):
+        candidate = prefix_bytes + bytes(suffix)
+        digest = hash_func(candidate).digest()
+        if digest in targets:
+            found[digest.hex()] = candidate.decode('utf-8')
+        count += 1
+    return found, count
+
+def brute_force(target_hashes, charset: str = DEFAULT_CHARSET, max_length: int = 4, algo: str = 'md5',
+                workers=None, prefix_length: int = 1, executor=None) -> dict:
+    """
+    Łamie skróty (hex) haseł o długości 0..max_length ze znaków charset (znaki jednobajtowe).
+    Hasła o danej długości dzielone są na fragmenty o wspólnym prefiksie długości prefix_length,
+    przetwarzane w puli procesów (nowej lub podanej w executor, np. przy wielu pomiarach).
+    Kończy po długości, na której znaleziono wszystkie skróty.
+    Zwraca słownik ze znalezionymi hasłami {skrót hex: hasło}, liczbą skrótów i szybkością.
+    """
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            return brute_force(target_hashes, charset, max_length, algo, prefix_length=prefix_length,
+                               executor=executor)
+    targets = frozenset(bytes.fromhex(h) for h in target_hashes)
+    found = {}
+    hashes = 0
+    start = time.perf_counter()
+    for length in range(max_length + 1):
+        split = min(prefix_length, length)
+        prefixes = [''.join(p) for p in itertools.product(charset, repeat=split)]
+        units = executor.map(_brute_force_unit, itertools.repeat(algo), itertools.repeat(charset), prefixes,
+                             itertools.repeat(length), itertools.repeat(targets))
+        for unit_found, unit_count in units:
+            found.update(unit_found)
+            hashes += unit_count
+        if len(found) == len(targets):
+            break
+    elapsed = time.perf_counter() - start
+    return {
+        "found": found,
+        "hashes": hashes,
+        "seconds": elapsed,
+        "hashes_per_second": hashes / elapsed if elapsed > 0 else 0,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Indeks skrótów haseł i łamanie krótkich haseł metodą brute-force.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="buduje indeks z listy słów")
+    build_parser.add_argument("wordlist", help="plik z hasłami (jedno w linii)")
+    build_parser.add_argument("index", help="plik wyjściowy indeksu")
+    build_parser.add_argument("--algo", default='md5', help="funkcja skrótu z hashlib")
+    lookup_parser = commands.add_parser("lookup", help="wyszukuje skróty w indeksie")
+    lookup_parser.add_argument("index", help="plik indeksu")
+    lookup_parser.add_argument("hashes", nargs="+", help="skróty hex")
+    brute_parser = commands.add_parser("brute", help="łamie skróty metodą brute-force")
+    brute_parser.add_argument("hashes", nargs="+", help="skróty hex")
+    brute_parser.add_argument("--charset", default=DEFAULT_CHARSET, help="alfabet haseł")
+    brute_parser.add_argument("--max-length", type=int, default=4, help="maksymalna długość hasła")
+    brute_parser.add_argument("--algo", default='md5', help="funkcja skrótu z hashlib")
+    brute_parser.add_argument("--workers", type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        count = build_index(args.wordlist, args.index, args.algo)
+        print(f"Zapisano {count} haseł w {time.perf_counter() - start:.2f} s")
+    elif args.command == "lookup":
+        with HashIndex(args.index) as index:
+            for digest, password in zip(args.hashes, index.lookup_many(args.hashes)):
+                print(f"{digest}: {password if password is not None else '-'}")
+    else:
+        result = brute_force(args.hashes, args.charset, args.max_length, args.algo, args.workers)
+        for digest in args.hashes:
+            print(f"{digest}: {result['found'].get(digest.lower(), '-')}")
+        print(f"Skróty: {result['hashes']}, czas: {result['seconds']:.2f} s, "
+              f"szybkość: {result['hashes_per_second'] / 1e6:.2f} mln skrótów/s")
@@ -0,0 +1,245 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from passwords import DEFAULT_CHARSET, brute_force
+
+# =====================================================================
+# Tablice tęczowe (kompromis czas-pamięć) dla krótkich haseł o stałej długości
+# Hasło to liczba 0..N-1 zapisana w systemie o podstawie len(charset).
+# Łańcuch: hasło -> skrót -> funkcja redukcji R_i (zależna od pozycji i) -> hasło ...
+# Zapisujemy tylko pary (koniec, początek) łańcuchów, posortowane po końcu.
+# Wyszukiwanie sprawdza kolejne pozycje od końca łańcucha i odtwarza łańcuch
+# dopiero wtedy, gdy wyliczony koniec znajduje się w tablicy.
+# =====================================================================
+
+TABLE_MAGIC = b"RAINBOW1"
+TABLE_HEADER = struct.Struct("<8s16s128sIIQ")  # magia, algorytm, alfabet, długość hasła, długość łańcucha, liczba łańcuchów
+RECORD_DTYPE = np.dtype([("end", "<u8"), ("start", "<u8")])
+
+class Keyspace:
+    """Przestrzeń haseł o długości length ze znaków charset, z funkcjami redukcji dla algorytmu algo."""
+
+    def __init__(self, charset: str = DEFAULT_CHARSET, length: int = 4, algo: str = 'md5'):
+        self.charset = charset
+        self.length = length
+        self.algo = algo
+        self.size = len(charset) ** length
+        self._symbols = charset.encode('utf-8')
+        self._hash_func = getattr(hashlib, algo)
+        if len(self._symbols) != len(charset):
+            raise ValueError("Alfabet może zawierać tylko znaki jednobajtowe")
+
+    def password(self, index: int) -> bytes:
+        base = len(self._symbols)
+        chars = bytearray(self.length)
+        for position in range(self.length - 1, -1, -1):
+            index, digit = divmod(index, base)
+            chars[position] = self._symbols[digit]
+        return bytes(chars)
+
+    def hash(self, password: bytes) -> bytes:
+        return self._hash_func(password).digest()
+
+    def reduce(self, digest: bytes, position: int) -> int:
+        """Funkcja redukcji R_position: skrót -> numer hasła (inna dla każdej pozycji w łańcuchu)."""
+        return (int.from_bytes(digest[:8], 'big') + position) % self.size
+
+    def walk(self, index: int, first: int, last: int) -> int:
+        """Przechodzi łańcuch od numeru hasła na pozycji first do pozycji last; zwraca numer hasła na pozycji last."""
+        password, hash_func, reduce = self.password, self._hash_func, self.reduce
+        for position in range(first, last):
+            index = reduce(hash_func(password(index)).digest(), position)
+        return index
+
+def _build_chains(charset: str, length: int, algo: str, chain_length: int, starts: np.ndarray) -> np.ndarray:
+    keyspace = Keyspace(charset, length, algo)
+    records = np.empty(len(starts), dtype=RECORD_DTYPE)
+    records["start"] = starts
+    records["end"] = [keyspace.walk(int(start), 0, chain_length) for start in starts]
+    return records
+
+def build_table(path, charset: str = DEFAULT_CHARSET, length: int = 4, algo: str = 'md5', chain_length: int = 200,
+                chains: int = 20000, workers=None, seed=None) -> dict:
+    """
+    Generuje łańcuchy w puli procesów (losowe, różne punkty startowe) i zapisuje tablicę do pliku.
+    Z łańcuchów o tym samym końcu (scalonych) zostaje jeden. Zwraca statystyki budowy.
+    """
+    keyspace = Keyspace(charset, length, algo)
+    if len(charset.encode('utf-8')) > 128:
+        raise ValueError("Alfabet może mieć co najwyżej 128 znaków")
+    rng = np.random.default_rng(seed)
+    starts = np.unique(rng.integers(0, keyspace.size, size=min(chains, keyspace.size), dtype=np.uint64))
+    workers = workers or os.cpu_count()
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = executor.map(_build_chains, [charset] * workers * 4, [length] * workers * 4, [algo] * workers * 4,
+                             [chain_length] * workers * 4, np.array_split(starts, workers * 4))
+        records = np.concatenate(list(parts))
+    records.sort(order="end", kind="stable")
+    _, first = np.unique(records["end"], return_index=True)
+    records = records[first]
+    with open(path, 'wb') as f:
+        f.write(TABLE_HEADER.pack(TABLE_MAGIC, algo.encode('ascii'), charset.encode('utf-8'), length, chain_length,
+                                  len(records)))
+        f.write(records.tobytes())
+    return {
+        "chains": len(records),
+        "merged": len(starts) - len(records),
+        "hashes": len(starts) * chain_length,
+        "seconds": time.perf_counter() - start_time,
+        "bytes": TABLE_HEADER.size + records.nbytes,
+    }
+
+class RainbowTable:
+    """Tablica tęczowa otwarta z pliku mapowanego w pamięci."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, algo, charset, length, chain_length, count = TABLE_HEADER.unpack_from(self._mapped)
+        if magic != TABLE_MAGIC:
+            raise ValueError("Plik nie jest tablicą tęczową")
+        self.keyspace = Keyspace(charset.rstrip(b"\0").decode('utf-8'), length, algo.rstrip(b"\0").decode('ascii'))
+        self.chain_length = chain_length
+        self.records = np.frombuffer(self._mapped, dtype=RECORD_DTYPE, count=count, offset=TABLE_HEADER.size)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.records = None
+        self._mapped.close()
+        self._file.close()
+
+    def _starts(self, end: int):
+        """Punkty startowe łańcuchów kończących się w end (wyszukiwanie binarne)."""
+        ends = self.records["end"]
+        left = np.searchsorted(ends, end, side='left')
+        right = np.searchsorted(ends, end, side='right')
+        return (int(start) for start in self.records["start"][left:right])
+
+    def lookup(self, digest) -> tuple[bytes | None, int]:
+        """
+        Szuka hasła dla skrótu (bytes lub hex). Zwraca krotkę (hasło lub None, liczba obliczonych skrótów).
+        """
+        if isinstance(digest, str):
+            digest = bytes.fromhex(digest)
+        keyspace = self.keyspace
+        hashes = 0
+        for position in range(self.chain_length - 1, -1, -1):
+            # zakładamy, że skrót pojawił się na pozycji position - liczymy koniec łańcucha
+            end = keyspace.walk(keyspace.reduce(digest, position), position + 1, self.chain_length)
+            hashes += self.chain_length - position - 1
+            for start in self._starts(end):
+                # odtwarzamy łańcuch tylko do pozycji position (możliwy fałszywy alarm po scaleniu łańcuchów)
+                candidate = keyspace.password(keyspace.walk(start, 0, position))
+                hashes += position + 1
+                if keyspace.hash(candidate) == digest:
+                    return candidate, hashes
+        return None, hashes
+
+def compare_with_brute_force(charset: str = DEFAULT_CHARSET, length: int = 4, algo: str = 'md5',
+                             chain_lengths=(50, 100, 200, 400), coverage: float = 2.0, samples: int = 20,
+                             workers=None, directory: str = None, seed=None) -> list:
+    """
+    Porównuje tablice o różnej długości łańcucha (liczba łańcuchów dobrana tak, by chains * chain_length
+    było równe coverage * N) z brute-force: rozmiar pliku, czas budowy, skuteczność i średni czas wyszukiwania.
+    Obie metody łamią te same skróty. Tablice zapisywane są w directory (domyślnie w katalogu tymczasowym,
+    usuwanym po porównaniu). Zwraca listę słowników, ostatni dotyczy brute-force.
+    """
+    if directory is None:
+        with tempfile.TemporaryDirectory() as directory:
+            return compare_with_brute_force(charset, length, algo, chain_lengths, coverage, samples, workers,
+                                            directory, seed)
+    keyspace = Keyspace(charset, length, algo)
+    rng = np.random.default_rng(seed)
+    passwords = [keyspace.password(int(i)) for i in rng.integers(0, keyspace.size, size=samples)]
+    digests = [keyspace.hash(password) for password in passwords]
+    results = []
+    for chain_length in chain_lengths:
+        path = os.path.join(directory, f"rainbow_{algo}_{length}_{chain_length}.bin")
+        chains = int(coverage * keyspace.size / chain_length)
+        build_stats = build_table(path, charset, length, algo, chain_length, chains, workers, seed)
+        with RainbowTable(path) as table:
+            start = time.perf_counter()
+            found = sum(table.lookup(digest)[0] == password for digest, password in zip(digests, passwords))
+            lookup_time = (time.perf_counter() - start) / samples
+        results.append({
+            "method": f"tęczowa t={chain_length}",
+            "bytes": build_stats["bytes"],
+            "build_seconds": build_stats["seconds"],
+            "success_rate": found / samples,
+            "lookup_seconds": lookup_time,
+        })
+    # Pula startuje raz i jest rozgrzewana przed pomiarem; każdy skrót łamany jest osobno, jak w tablicy.
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        brute_force([digests[0].hex()], charset, length, algo, executor=executor)
+        found = 0
+        seconds = 0.0
+        for digest, password in zip(digests, passwords):
+            result = brute_force([digest.hex()], charset, length, algo, executor=executor)
+            found += result["found"].get(digest.hex()) == password.decode('utf-8')
+            seconds += result["seconds"]
+    results.append({
+        "method": "brute-force",
+        "bytes": 0,
+        "build_seconds": 0.0,
+        "success_rate": found / samples,
+        "lookup_seconds": seconds / samples,
+    })
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tablice tęczowe dla krótkich haseł.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="generuje tablicę")
+    build_parser.add_argument("table", help="plik wyjściowy tablicy")
+    build_parser.add_argument("--chain-length", type=int, default=200, help="długość łańcucha")
+    build_parser.add_argument("--chains", type=int, default=20000, help="liczba łańcuchów")
+    lookup_parser = commands.add_parser("lookup", help="wyszukuje skróty w tablicy")
+    lookup_parser.add_argument("table", help="plik tablicy")
+    lookup_parser.add_argument("hashes", nargs="+", help="skróty hex")
+    compare_parser = commands.add_parser("compare", help="porównuje tablice o różnej długości łańcucha z brute-force")
+    compare_parser.add_argument("--chain-lengths", type=int, nargs="+", default=[50, 100, 200, 400])
+    compare_parser.add_argument("--samples", type=int, default=20, help="liczba łamanych skrótów")
+    for sub in (build_parser, compare_parser):
+        sub.add_argument("--charset", default=DEFAULT_CHARSET, help="alfabet haseł")
+        sub.add_argument("--length", type=int, default=4, help="długość hasła")
+        sub.add_argument("--algo", default='md5', help="funkcja skrótu z hashlib")
+        sub.add_argument("--workers", type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        stats = build_table(args.table, args.charset, args.length, args.algo, args.chain_length, args.chains, args.workers)
+        print(f"Łańcuchy: {stats['chains']} (scalonych: {stats['merged']}), skróty: {stats['hashes']}, "
+              f"czas: {stats['seconds']:.2f} s, plik: {stats['bytes'] / 1024:.1f} KB")
+    elif args.command == "lookup":
+        with RainbowTable(args.table) as table:
+            for digest in args.hashes:
+                start = time.perf_counter()
+                password, hashes = table.lookup(digest)
+                elapsed = time.perf_counter() - start
+                result = password.decode('utf-8') if password is not None else '-'
+                print(f"{digest}: {result} ({hashes} skrótów, {elapsed * 1000:.1f} ms)")
+    else:
+        results = compare_with_brute_force(args.charset, args.length, args.algo, args.chain_lengths,
+                                           samples=args.samples, workers=args.workers)
+        print(f"{'Metoda':<18} | {'Plik [KB]':<10} | {'Budowa [s]':<10} | {'Skuteczność':<11} | {'Wyszukanie [ms]':<15}")
+        print("-" * 76)
+        for row in results:
+            print(f"{row['method']:<18} | {row['bytes'] / 1024:<10.1f} | {row['build_seconds']:<10.2f} | "
+                  f"{row['success_rate']:<11.0%} | {row['lookup_seconds'] * 1000:<15.1f}")
@@ -0,0 +1,176 @@
+import argparse
+import hashlib
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# =====================================================================
+# Zwektoryzowany silnik kryterium SAC (Strict Avalanche Criterion)
+# Dla każdej próbki budujemy od razu wszystkie wejścia z jednym zmienionym bitem
+# (jedna tablica NumPy), haszujemy je w jednej pętli, a różnice skrótów liczymy
+# jako macierz uint8 (XOR + unpackbits) zamiast porównywania ciągów '0'/'1'.
+# Wynikiem jest macierz: bit wejściowy x bit wyjściowy -> liczba zmian.
+# =====================================================================
+
+def flipped_inputs(data: bytes) -> np.ndarray:
+    """
+    Zwraca macierz (8 * len(data), len(data)) - wiersz i to dane z odwróconym bitem i.
+    Bit i to bit i % 8 (licząc od najmłodszego) w bajcie i // 8.
+    """
+    size = len(data)
+    rows = np.tile(np.frombuffer(data, dtype=np.uint8), (8 * size, 1))
+    bit_index = np.arange(8 * size)
+    rows[bit_index, bit_index // 8] ^= (1 << (bit_index % 8)).astype(np.uint8)
+    return rows
+
+def hash_rows(hash_func_name: str, rows: np.ndarray) -> np.ndarray:
+    """Haszuje każdy wiersz macierzy i zwraca skróty jako macierz uint8 (wiersze x bajty skrótu)."""
+    hash_func = getattr(hashlib, hash_func_name)
+    digests = b''.join([hash_func(row).digest() for row in rows])
+    return np.frombuffer(digests, dtype=np.uint8).reshape(len(rows), -1)
+
+def sample_flip_counts(hash_func_name: str, data: bytes) -> np.ndarray:
+    """Macierz 0/1 (bity wejścia x bity wyjścia) zmian skrótu dla jednej próbki danych."""
+    original = np.frombuffer(getattr(hashlib, hash_func_name)(data).digest(), dtype=np.uint8)
+    flipped = hash_rows(hash_func_name, flipped_inputs(data))
+    return np.unpackbits(flipped ^ original, axis=1)
+
+def sac_flip_counts(hash_func_name='sha256', input_size=32, samples=10, inputs=None) -> np.ndarray:
+    """
+    Sumuje macierze zmian dla kolejnych próbek (domyślnie losowych, lub podanych w inputs).
+    Zwraca macierz int64 (bity wejścia x bity wyjścia) z liczbą zmian każdego bitu wyjścia.
+    """
+    if inputs is None:
+        inputs = (secrets.token_bytes(input_size) for _ in range(samples))
+    counts = None
+    for data in inputs:
+        flips = sample_flip_counts(hash_func_name, data)
+        if counts is None:
+            counts = np.zeros(flips.shape, dtype=np.int64)
+        counts += flips
+    return counts
+
+def sac_matrix(hash_func_name='sha256', input_size=32, samples=10) -> np.ndarray:
+    """Macierz prawdopodobieństw zmiany bitu wyjścia (kolumny) po odwróceniu bitu wejścia (wiersze)."""
+    return sac_flip_counts(hash_func_name, input_size, samples) / samples
+
+# =====================================================================
+# Równoległa analiza SAC i BIC (Bit Independence Criterion)
+# Próbki dzielone są między procesy, każdy proces zwraca własne macierze zliczeń,
+# które sumujemy. Dla BIC zliczamy wspólne zmiany par bitów wyjścia (F^T F),
+# z których liczymy współczynnik korelacji zmian każdej pary bitów wyjścia.
+# =====================================================================
+
+def co_occurrence(bits: np.ndarray) -> np.ndarray:
+    """Macierz int64 wspólnych jedynek par kolumn macierzy 0/1 (bits^T bits, najwyżej 2^24 wierszy)."""
+    as_float = bits.astype(np.float32)  # iloczyn macierzy przez BLAS, wartości dokładne (< 2^24)
+    return np.rint(as_float.T @ as_float).astype(np.int64)
+
+def correlation_matrix(ones: np.ndarray, co_ones: np.ndarray, observations: int) -> np.ndarray:
+    """
+    Współczynniki korelacji par bitów z liczby jedynek każdego bitu (ones) i wspólnych jedynek
+    par bitów (co_ones) w observations obserwacjach. Dla bitów stałych wynik to nan.
+    """
+    p = ones / observations
+    covariance = co_ones / observations - np.outer(p, p)
+    std = np.sqrt(p * (1 - p))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return covariance / np.outer(std, std)
+
+def _shard_inputs(input_size: int, samples: int, seed):
+    if seed is None:
+        return (secrets.token_bytes(input_size) for _ in range(samples))
+    rng = np.random.default_rng(seed)
+    return (rng.bytes(input_size) for _ in range(samples))
+
+def sac_bic_counts(hash_func_name='sha256', input_size=32, samples=10, seed=None) -> dict:
+    """
+    Zlicza zmiany bitów wyjścia (SAC) i wspólne zmiany par bitów wyjścia (BIC) dla jednej partii próbek.
+    Zwraca słownik z macierzami flip_counts (wejście x wyjście) i co_flips (wyjście x wyjście).
+    """
+    output_bits = getattr(hashlib, hash_func_name)().digest_size * 8
+    flip_counts = np.zeros((input_size * 8, output_bits), dtype=np.int64)
+    co_flips = np.zeros((output_bits, output_bits), dtype=np.int64)
+    for data in _shard_inputs(input_size, samples, seed):
+        flips = sample_flip_counts(hash_func_name, data)
+        flip_counts += flips
+        co_flips += co_occurrence(flips)
+    return {
+        "hash": hash_func_name,
+        "input_size": input_size,
+        "samples": samples,
+        "flip_counts": flip_counts,
+        "co_flips": co_flips,
+    }
+
+def merge_counts(results) -> dict:
+    """Sumuje wyniki sac_bic_counts() z kolejnych partii (np. z różnych procesów)."""
+    results = [result for result in results if result["samples"]]
+    merged = dict(results[0])
+    for result in results[1:]:
+        merged["samples"] += result["samples"]
+        merged["flip_counts"] = merged["flip_counts"] + result["flip_counts"]
+        merged["co_flips"] = merged["co_flips"] + result["co_flips"]
+    return merged
+
+def parallel_sac_bic(hash_func_name='sha256', input_size=32, samples=100, workers=None, seed=None) -> dict:
+    """
+    Dzieli próbki między procesy, a następnie scala ich macierze zliczeń.
+    Z ziarnem seed wynik jest powtarzalny dla danej liczby procesów (każda partia dostaje własne ziarno potomne).
+    """
+    if samples < 1:
+        raise ValueError("Liczba próbek musi być dodatnia")
+    workers = max(1, min(workers or os.cpu_count(), samples))
+    shard_sizes = [samples // workers + (i < samples % workers) for i in range(workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers) if seed is not None else [None] * workers
+    if workers == 1:
+        return sac_bic_counts(hash_func_name, input_size, samples, seeds[0])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(sac_bic_counts, hash_func_name, input_size, size, shard_seed)
+                   for size, shard_seed in zip(shard_sizes, seeds)]
+        return merge_counts([future.result() for future in futures])
+
+def bic_matrix(result: dict) -> np.ndarray:
+    """
+    Macierz współczynników korelacji zmian par bitów wyjścia (idealnie 0 poza przekątną).
+    Każda zmiana pojedynczego bitu wejścia w każdej próbce to jedna obserwacja.
+    """
+    observations = result["samples"] * result["flip_counts"].shape[0]
+    return correlation_matrix(result["flip_counts"].sum(axis=0), result["co_flips"], observations)
+
+def save_results(path, result: dict):
+    """Zapisuje macierze zliczeń do skompresowanego pliku .npz (do późniejszego rysowania map cieplnych)."""
+    np.savez_compressed(path, flip_counts=result["flip_counts"], co_flips=result["co_flips"],
+                        samples=result["samples"], input_size=result["input_size"], hash=result["hash"])
+
+def load_results(path) -> dict:
+    with np.load(path) as data:
+        return {
+            "hash": str(data["hash"]),
+            "input_size": int(data["input_size"]),
+            "samples": int(data["samples"]),
+            "flip_counts": data["flip_counts"],
+            "co_flips": data["co_flips"],
+        }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Równoległa analiza kryteriów SAC i BIC funkcji skrótu.")
+    parser.add_argument("--hash", default='sha256', help="funkcja skrótu z hashlib")
+    parser.add_argument("--input-size", type=int, default=32, help="rozmiar danych wejściowych w bajtach")
+    parser.add_argument("--samples", type=int, default=1000, help="liczba losowych próbek")
+    parser.add_argument("--workers", type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--seed", type=int, default=None, help="ziarno dla powtarzalnych wyników")
+    parser.add_argument("--output", help="plik .npz z macierzami zliczeń")
+    args = parser.parse_args()
+
+    result = parallel_sac_bic(args.hash, args.input_size, args.samples, args.workers, args.seed)
+    if args.output:
+        save_results(args.output, result)
+    sac = result["flip_counts"] / result["samples"]
+    bic = bic_matrix(result)
+    off_diagonal = np.abs(bic[~np.eye(len(bic), dtype=bool)])
+    print(f"Funkcja skrótu: {args.hash.upper()}, próbki: {result['samples']}, wejście: {args.input_size} B")
+    print(f"SAC: średnia {sac.mean():.4f}, min {sac.min():.4f}, max {sac.max():.4f} (ideał 0.5)")
+    print(f"BIC: średnia |korelacja| {off_diagonal.mean():.4f}, max {off_diagonal.max():.4f} (ideał 0)")
@@ -1,50 +1,98 @@
 # ciphers.py
 
 from Crypto.Cipher import AES 
+import io
 import os 
 import numpy as np
 
 BLOCK_SIZE = 16
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # wielokrotność BLOCK_SIZE
 AES_KEY = os.urandom(16)
 IV = os.urandom(16)
 NONCE = os.urandom(8)
 
+def _check_chunk_size(chunk_size: int):
+    if chunk_size <= 0 or chunk_size % BLOCK_SIZE:
+        raise ValueError(f"Rozmiar fragmentu musi być dodatnią wielokrotnością {BLOCK_SIZE} bajtów")
+
+def _remaining_size(src):
+    # liczba bajtów do końca pliku lub None, jeśli strumienia nie da się sprawdzić (np. potok)
+    try:
+        return os.fstat(src.fileno()).st_size - src.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+    if hasattr(src, "seekable") and src.seekable():
+        position = src.tell()
+        end = src.seek(0, io.SEEK_END)
+        src.seek(position)
+        return end - position
+    return None
+
+def _read_chunk(src, chunk_size: int) -> bytes:
+    # strumienie surowe (potoki, gniazda) mogą zwracać mniej danych niż chcemy - czytamy do pełnego
+    # fragmentu lub końca danych, więc krótszy może być tylko ostatni fragment
+    chunk = src.read(chunk_size)
+    if not chunk or len(chunk) == chunk_size:
+        return chunk
+    parts = [chunk]
+    remaining = chunk_size - len(chunk)
+    while remaining and (part := src.read(remaining)):
+        parts.append(part)
+        remaining -= len(part)
+    return b''.join(parts)
+
 class CipherMode:
+    block_aligned = False  # True - tryb bez dopełnienia, dane muszą mieć długość będącą wielokrotnością BLOCK_SIZE
+
     def __init__(self, key=AES_KEY):
         self.key = key
     
-    def encrypt(self, plaintext: bytes) -> bytes:
+    def _new_cipher(self):
         raise NotImplementedError
     
+    def encrypt(self, plaintext: bytes) -> bytes:
+        return self._new_cipher().encrypt(plaintext)
+    
     def decrypt (self, ciphertext: bytes) -> bytes:
-        raise NotImplementedError
+        return self._new_cipher().decrypt(ciphertext)
     
-class ECBMode(CipherMode):
-    def encrypt(self, plaintext: bytes) -> bytes:
-        cipher = AES.new(self.key, AES.MODE_ECB)
-        return cipher.encrypt(plaintext)
+    # Szyfrowanie strumieniowe: src i dst to pliki binarne, przetwarzane fragmentami o stałym rozmiarze.
+    # Obiekt AES z biblioteki pamięta stan między wywołaniami (ostatni blok w CBC, licznik w CTR),
+    # więc wynik jest taki sam jak dla encrypt()/decrypt() na całych danych. Zwraca liczbę zapisanych bajtów.
+    # ECB i CBC z biblioteki nie dopełniają danych - długość src jest sprawdzana przed zapisem czegokolwiek
+    # (dla strumieni bez rozmiaru, np. potoków, dane i tak muszą być wyrównane do BLOCK_SIZE).
+    def encrypt_stream(self, src, dst, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        return self._process_stream(self._new_cipher().encrypt, src, dst, chunk_size)
     
-    def decrypt(self, ciphertext: bytes) -> bytes:
-        cipher = AES.new(self.key, AES.MODE_ECB)
-        return cipher.decrypt(ciphertext)
+    def decrypt_stream(self, src, dst, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        return self._process_stream(self._new_cipher().decrypt, src, dst, chunk_size)
     
-class CBCMode(CipherMode):
-    def encrypt(self, plaintext: bytes) -> bytes:
-        cipher = AES.new(self.key, AES.MODE_CBC, iv=IV)
-        return cipher.encrypt(plaintext)
+    def _process_stream(self, process, src, dst, chunk_size: int) -> int:
+        _check_chunk_size(chunk_size)
+        if self.block_aligned:
+            size = _remaining_size(src)
+            if size is not None and size % BLOCK_SIZE:
+                raise ValueError(f"Tryb {type(self).__name__} wymaga danych o długości będącej wielokrotnością {BLOCK_SIZE} bajtów")
+        written = 0
+        while chunk := _read_chunk(src, chunk_size):
+            written += dst.write(process(chunk))
+        return written
     
-    def decrypt(self, ciphertext:bytes) -> bytes:
-        cipher = AES.new(self.key, AES.MODE_CBC, iv=IV)
-        return cipher.decrypt(ciphertext)
+class ECBMode(CipherMode):
+    block_aligned = True
+
+    def _new_cipher(self):
+        return AES.new(self.key, AES.MODE_ECB)
     
-class CTRMode(CipherMode):
-    def encrypt(self, plaintext: bytes) -> bytes:
-        cipher = AES.new(self.key, AES.MODE_CTR, nonce=NONCE)
-        return cipher.encrypt(plaintext)
+class CBCMode(CipherMode):
+    block_aligned = True
+
+    def _new_cipher(self):
+        return AES.new(self.key, AES.MODE_CBC, iv=IV)
     
-    def decrypt(self, ciphertext: bytes) -> bytes:
-        cipher = AES.new(self.key, AES.MODE_CTR, nonce=NONCE)
-        return cipher.decrypt(ciphertext)
+class CTRMode(CipherMode):
+    def _new_cipher(self):
+        return AES.new(self.key, AES.MODE_CTR, nonce=NONCE)
     
 class ManualCBC(CipherMode):
     def __init__(self, key=AES_KEY, iv=IV):
@@ -60,12 +108,9 @@ class ManualCBC(CipherMode):
         padding_length = data[-1]
         return data[:-padding_length]
 
-    def encrypt(self, plaintext: bytes) -> bytes:
-        plaintext = self._pad(plaintext)
+    def _encrypt_blocks(self, plaintext: bytes, previous: np.ndarray):
         # ciphertext = b""
         ciphertext_blocks = []
-        # previous = self.iv
-        previous = np.frombuffer(self.iv, dtype=np.uint8)
 
         for i in range(0, len(plaintext), BLOCK_SIZE):
             block = plaintext[i:i+BLOCK_SIZE]
@@ -79,13 +124,11 @@ class ManualCBC(CipherMode):
             # previous = encrypted
             previous = np.frombuffer(encrypted, dtype=np.uint8)
         # return ciphertext
-        return b''.join(ciphertext_blocks)
+        return b''.join(ciphertext_blocks), previous
     
-    def decrypt(self, ciphertext: bytes) -> bytes:
+    def _decrypt_blocks(self, ciphertext: bytes, previous: np.ndarray):
         # plaintext = b""
         plaintext_blocks = []
-        # previous = self.iv
-        previous = np.frombuffer(self.iv, dtype=np.uint8)
 
         for i in range(0, len(ciphertext), BLOCK_SIZE):
             block = ciphertext[i:i+BLOCK_SIZE]
@@ -98,7 +141,38 @@ class ManualCBC(CipherMode):
             # previous = block
             previous = np.frombuffer(block, dtype=np.uint8)
         # return self._unpad(plaintext)
-        plaintext = b''.join(plaintext_blocks)
+        return b''.join(plaintext_blocks), previous
+    
+    def encrypt(self, plaintext: bytes) -> bytes:
+        # previous = self.iv
+        ciphertext, _ = self._encrypt_blocks(self._pad(plaintext), np.frombuffer(self.iv, dtype=np.uint8))
+        return ciphertext
+    
+    def decrypt(self, ciphertext: bytes) -> bytes:
+        plaintext, _ = self._decrypt_blocks(ciphertext, np.frombuffer(self.iv, dtype=np.uint8))
         return self._unpad(plaintext)
+    
+    # Ostatni blok jest znany dopiero po odczytaniu kolejnego fragmentu - dopełnienie (PKCS7)
+    # dodajemy/usuwamy tylko w ostatnim fragmencie, a ostatni blok szyfrogramu przechodzi dalej jako IV.
+    def _process_padded_stream(self, process_blocks, finish, src, dst, chunk_size: int) -> int:
+        _check_chunk_size(chunk_size)
+        previous = np.frombuffer(self.iv, dtype=np.uint8)
+        written = 0
+        chunk = _read_chunk(src, chunk_size)
+        while True:
+            next_chunk = _read_chunk(src, chunk_size)
+            if not next_chunk:
+                return written + dst.write(finish(chunk, previous))
+            output, previous = process_blocks(chunk, previous)
+            written += dst.write(output)
+            chunk = next_chunk
+    
+    def encrypt_stream(self, src, dst, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        finish = lambda chunk, previous: self._encrypt_blocks(self._pad(chunk), previous)[0]
+        return self._process_padded_stream(self._encrypt_blocks, finish, src, dst, chunk_size)
+    
+    def decrypt_stream(self, src, dst, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        finish = lambda chunk, previous: self._unpad(self._decrypt_blocks(chunk, previous)[0])
+        return self._process_padded_stream(self._decrypt_blocks, finish, src, dst, chunk_size)
 
         
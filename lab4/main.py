@@ -1,10 +1,11 @@
 # main.py
 
 from pathlib import Path
-from ciphers import ECBMode, CBCMode, CTRMode, ManualCBC
+from ciphers import ECBMode, CBCMode, CTRMode, ManualCBC, DEFAULT_CHUNK_SIZE
 from utils import measure_time, analyze_error_propagation
 from generator import generate_files
 import csv
+import filecmp
 from plot_results import plot_times, plot_error_propagation, plot_times_library_only, plot_error_propagation_per_file, plot_encryption_decryption_ratio
 
 results = []
@@ -44,6 +45,31 @@ def process_file(file_path):
 
         results_errors.append([file_path.name, mode_class.__name__, diff_input, diff_cipher])
 
+def process_file_stream(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    # szyfrowanie plik -> plik fragmentami, bez wczytywania całego pliku do pamięci
+    encrypted_path = file_path.with_name(file_path.name + ".enc")
+    decrypted_path = file_path.with_name(file_path.name + ".dec")
+
+    for mode_class in MODES_TO_TEST:
+        cipher = mode_class()
+        print(f"\n Tryb (strumieniowo): {mode_class.__name__}")
+
+        with open(file_path, 'rb') as src, open(encrypted_path, 'wb') as dst:
+            (_, enc_time) = measure_time(cipher.encrypt_stream)(src, dst, chunk_size)
+        print(f"Czas szyfrowania: {enc_time:.6f} sekundy")
+
+        with open(encrypted_path, 'rb') as src, open(decrypted_path, 'wb') as dst:
+            (_, dec_time) = measure_time(cipher.decrypt_stream)(src, dst, chunk_size)
+        print(f"Czas deszyfrowania: {dec_time:.6f} sekundy")
+
+        if not filecmp.cmp(file_path, decrypted_path, shallow=False):
+            print("Błąd: Otrzymano inny tekst jawny po deszyfrowaniu.")
+        else:
+            print("Deszyfrowanie zakończone sukcesem.")
+
+    encrypted_path.unlink()
+    decrypted_path.unlink()
+
     
 
 if __name__ == "__main__":
@@ -55,6 +81,7 @@ if __name__ == "__main__":
         print(f"Przetwarzanie pliku: {file.name}")
         print(f"=========================")
         process_file(file)
+        process_file_stream(file)
 
     with open("results.csv", "w", newline="") as f:
         writer = csv.writer(f)